@@ -5,6 +5,7 @@ Click anywhere on the map to get weather information
 import streamlit as st
 import sys
 import os
+import folium
 from streamlit_folium import st_folium
 
 # Add parent directory to path
@@ -92,11 +93,12 @@ st.markdown("### 🗺️ Click on the map to select a location")
 # Determine map center
 center = [st.session_state['selected_lat'], st.session_state['selected_lon']]
 
-# Create base map
+# Create base map; markers go on a layer that st_folium adds on top
 m = create_base_map(center=center, zoom=10)
+markers = folium.FeatureGroup(name="Markers")
 
 # Add popular cities markers
-m = add_popular_cities(m, show_markers=True)
+add_popular_cities(markers, show_markers=True)
 
 # Get current weather for selected location
 current_weather = get_current_weather(
@@ -106,8 +108,8 @@ current_weather = get_current_weather(
 
 # Add marker for selected location
 if current_weather:
-    m = add_weather_marker(
-        m,
+    add_weather_marker(
+        markers,
         st.session_state['selected_lat'],
         st.session_state['selected_lon'],
         current_weather
@@ -116,6 +118,7 @@ if current_weather:
 # Display map
 map_data = st_folium(
     m,
+    feature_group_to_add=markers,
     width=None,
     height=500,
     returned_objects=["last_clicked"]
@@ -68,6 +68,18 @@ def get_air_quality_estimate(visibility, humidity):
     else:
         return "Buruk", "#e53e3e", "😷", 150
 
+def indicator_card(title, level, color, emoji, note=None):
+    """Render a coloured indicator card with an emoji, title, level and optional note"""
+    note_html = f'''
+            <p style="text-align: center; font-size: 0.9rem; color: #666; margin: 0.5rem 0;">{note}</p>''' if note else ''
+    st.markdown(f"""
+        <div style="background: {color}22; padding: 1.5rem; border-radius: 12px; border: 2px solid {color};">
+            <div style="font-size: 3rem; text-align: center;">{emoji}</div>
+            <h3 style="text-align: center; color: {color}; margin: 0.5rem 0;">{title}</h3>
+            <p style="text-align: center; font-size: 1.2rem; font-weight: bold; margin: 0;">{level}</p>{note_html}
+        </div>
+        """, unsafe_allow_html=True)
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -195,36 +207,17 @@ if weather:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown(f"""
-        <div style="background: {comfort_color}22; padding: 1.5rem; border-radius: 12px; border: 2px solid {comfort_color};">
-            <div style="font-size: 3rem; text-align: center;">{comfort_emoji}</div>
-            <h3 style="text-align: center; color: {comfort_color}; margin: 0.5rem 0;">Tingkat Kenyamanan</h3>
-            <p style="text-align: center; font-size: 1.2rem; font-weight: bold; margin: 0;">{comfort_level}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        indicator_card("Tingkat Kenyamanan", comfort_level, comfort_color, comfort_emoji)
     
     with col2:
-        st.markdown(f"""
-        <div style="background: {uv_color}22; padding: 1.5rem; border-radius: 12px; border: 2px solid {uv_color};">
-            <div style="font-size: 3rem; text-align: center;">{uv_emoji}</div>
-            <h3 style="text-align: center; color: {uv_color}; margin: 0.5rem 0;">Risiko UV</h3>
-            <p style="text-align: center; font-size: 1.2rem; font-weight: bold; margin: 0;">{uv_risk}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        indicator_card("Risiko UV", uv_risk, uv_color, uv_emoji)
     
     with col3:
         # Air quality estimate
         visibility = weather.get('cloud_cover', 50)  # Using cloud cover as proxy
         aq_level, aq_color, aq_emoji, aqi = get_air_quality_estimate(10000 - visibility*100, humidity)
         
-        st.markdown(f"""
-        <div style="background: {aq_color}22; padding: 1.5rem; border-radius: 12px; border: 2px solid {aq_color};">
-            <div style="font-size: 3rem; text-align: center;">{aq_emoji}</div>
-            <h3 style="text-align: center; color: {aq_color}; margin: 0.5rem 0;">Kualitas Udara</h3>
-            <p style="text-align: center; font-size: 1.2rem; font-weight: bold; margin: 0;">{aq_level}</p>
-            <p style="text-align: center; font-size: 0.9rem; color: #666; margin: 0.5rem 0;">AQI: ~{aqi}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        indicator_card("Kualitas Udara", aq_level, aq_color, aq_emoji, note=f"AQI: ~{aqi}")
     
     st.markdown("---")
     
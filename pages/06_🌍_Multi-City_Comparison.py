@@ -12,7 +12,8 @@ import plotly.graph_objects as go
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from utils.weather_api import get_current_weather, search_city, get_daily_forecast, get_weather_emoji, get_weather_description
+from utils.weather_api import search_city, get_weather_emoji, get_weather_description
+from utils.cached_api import cached_current, cached_daily, fetch_all
 from utils.map_utils import POPULAR_CITIES
 
 # Page configuration
@@ -101,15 +102,20 @@ with st.spinner("Fetching weather data for all cities..."):
     weather_data = []
     forecast_data = []
     
-    for city in st.session_state['comparison_cities']:
+    # Current weather and 7-day forecast for every city, requested concurrently
+    selected_cities = st.session_state['comparison_cities']
+    results = fetch_all(
+        [(cached_current, (city['lat'], city['lon'])) for city in selected_cities] +
+        [(cached_daily, (city['lat'], city['lon'], 7)) for city in selected_cities]
+    )
+    
+    for city, current, forecast in zip(selected_cities, results[:len(selected_cities)], results[len(selected_cities):]):
         # Current weather
-        current = get_current_weather(city['lat'], city['lon'])
         if current:
             current['city'] = city['name']
             weather_data.append(current)
         
         # Forecast
-        forecast = get_daily_forecast(city['lat'], city['lon'], days=7)
         if forecast is not None:
             forecast['city'] = city['name']
             forecast_data.append(forecast)
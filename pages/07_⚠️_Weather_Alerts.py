@@ -11,7 +11,8 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from utils.weather_api import get_current_weather, get_daily_forecast, get_hourly_forecast, get_weather_description
+from utils.weather_api import get_weather_description
+from utils.cached_api import cached_current, cached_daily, cached_hourly, fetch_all
 
 # Page configuration
 st.set_page_config(
@@ -45,22 +46,15 @@ humidity_high = st.sidebar.slider("High Humidity Alert (%)", 70, 100, 85)
 
 # Fetch weather data
 with st.spinner("Analyzing weather conditions..."):
-    current_weather = get_current_weather(
-        st.session_state['selected_lat'],
-        st.session_state['selected_lon']
-    )
+    lat = st.session_state['selected_lat']
+    lon = st.session_state['selected_lon']
     
-    daily_forecast = get_daily_forecast(
-        st.session_state['selected_lat'],
-        st.session_state['selected_lon'],
-        days=7
-    )
-    
-    hourly_forecast = get_hourly_forecast(
-        st.session_state['selected_lat'],
-        st.session_state['selected_lon'],
-        hours=24
-    )
+    # The three endpoints are requested at the same time
+    current_weather, daily_forecast, hourly_forecast = fetch_all([
+        (cached_current, (lat, lon)),
+        (cached_daily, (lat, lon, 7)),
+        (cached_hourly, (lat, lon, 24))
+    ])
 
 # Analyze alerts
 alerts = []
@@ -6,6 +6,7 @@ import streamlit as st
 import sys
 import os
 import pandas as pd
+import numpy as np
 import altair as alt
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -174,8 +175,16 @@ if rainfall_df is not None and len(rainfall_df) > 0:
     # Daily Rainfall Pattern
     st.markdown("### 📈 Daily Rainfall Pattern")
     
+    # Aggregate to weekly totals for multi-year ranges to keep the chart payload small
+    if (end_date - start_date).days > 730:
+        plot_df = rainfall_df.set_index('date')['precipitation_sum'].resample('W').sum().reset_index()
+        y_title = 'Weekly Rainfall (mm)'
+    else:
+        plot_df = rainfall_df[['date', 'precipitation_sum']]
+        y_title = 'Rainfall (mm)'
+    
     # Create daily rainfall chart
-    daily_chart = alt.Chart(rainfall_df).mark_area(
+    daily_chart = alt.Chart(plot_df).mark_area(
         line={'color': '#4299e1'},
         color=alt.Gradient(
             gradient='linear',
@@ -187,7 +196,7 @@ if rainfall_df is not None and len(rainfall_df) > 0:
         )
     ).encode(
         x=alt.X('date:T', title='Date'),
-        y=alt.Y('precipitation_sum:Q', title='Rainfall (mm)'),
+        y=alt.Y('precipitation_sum:Q', title=y_title),
         tooltip=['date:T', 'precipitation_sum:Q']
     ).properties(
         height=400
@@ -204,25 +213,27 @@ if rainfall_df is not None and len(rainfall_df) > 0:
     
     with col1:
         # Categorize rainfall intensity
-        def categorize_rainfall(mm):
-            if mm == 0:
-                return "No Rain"
-            elif mm < 5:
-                return "Light (0-5mm)"
-            elif mm < 20:
-                return "Moderate (5-20mm)"
-            elif mm < 50:
-                return "Heavy (20-50mm)"
-            else:
-                return "Very Heavy (>50mm)"
+        intensity_labels = [
+            "No Rain",
+            "Light (0-5mm)",
+            "Moderate (5-20mm)",
+            "Heavy (20-50mm)",
+            "Very Heavy (>50mm)"
+        ]
+        precip = rainfall_df['precipitation_sum'].to_numpy(dtype=float)
+        codes = np.where(precip != 0, np.digitize(precip, [5, 20, 50]) + 1, 0)
         
-        rainfall_df['intensity'] = rainfall_df['precipitation_sum'].apply(categorize_rainfall)
-        intensity_counts = rainfall_df['intensity'].value_counts()
+        # Days without a reading (NaN) get no class and are left out of the counts
+        missing = np.isnan(precip)
+        codes[missing] = -1
+        rainfall_df['intensity'] = pd.Categorical.from_codes(codes, categories=intensity_labels)
+        counts = np.bincount(codes[~missing], minlength=len(intensity_labels))
+        intensity_counts = dict(zip(intensity_labels, counts.tolist()))
         
         # Create pie chart
         fig = go.Figure(data=[go.Pie(
-            labels=intensity_counts.index,
-            values=intensity_counts.values,
+            labels=intensity_labels,
+            values=counts,
             hole=0.4,
             marker=dict(colors=['#e2e8f0', '#90cdf4', '#4299e1', '#2b6cb0', '#1a365d'])
         )])
@@ -11,12 +11,11 @@ import altair as alt
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
-from scipy import stats
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from utils.weather_api import get_historical_weather
+from utils.cached_api import cached_historical
 
 # Page configuration
 st.set_page_config(
@@ -25,9 +24,32 @@ st.set_page_config(
     layout="wide"
 )
 
+# Shared layout for the date-axis charts on this page
+TIMESERIES_LAYOUT = dict(
+    xaxis_title='Date',
+    height=400,
+    hovermode='x unified'
+)
+
+# Shared layout for the binned distribution charts (adjacent bars, no gaps)
+HISTOGRAM_LAYOUT = dict(
+    yaxis_title='Frequency',
+    height=350,
+    bargap=0
+)
+
+# Entries kept per cached function (enriched frames and each figure builder);
+# the cache is shared by all sessions, so it needs a bound as well as the TTL
+DATA_CACHE_SIZE = 32
+
 # Utility functions
 def calculate_heat_index(temp_c, humidity):
-    """Calculate heat index (feels like temperature in hot conditions)"""
+    """
+    Calculate heat index (feels like temperature in hot conditions)
+    
+    Pure arithmetic, so it works element-wise on scalars, NumPy arrays or
+    pandas Series (pass `.to_numpy()` for the fastest path).
+    """
     temp_f = temp_c * 9/5 + 32
     hi = -42.379 + 2.04901523*temp_f + 10.14333127*humidity - 0.22475541*temp_f*humidity
     hi -= 0.00683783*temp_f*temp_f - 0.05481717*humidity*humidity
@@ -35,35 +57,430 @@ def calculate_heat_index(temp_c, humidity):
     hi -= 0.00000199*temp_f*temp_f*humidity*humidity
     return (hi - 32) * 5/9  # Convert back to Celsius
 
+# UV index classes: upper bounds (exclusive) and per-class lookup tables.
+# The trailing entry of each table is used for missing values.
+_UV_BINS = np.array([3, 6, 8, 11])
+_UV_LABELS = ('Low', 'Moderate', 'High', 'Very High', 'Extreme', 'Unknown')
+_UV_COLORS = ('#48bb78', '#ed8936', '#dd6b20', '#c53030', '#742a2a', '#718096')
+_UV_EMOJIS = ('😊', '😐', '😰', '😱', '☠️', '❓')
+_UV_ADVICE = (
+    "Minimal protection needed. Safe to be outside.",
+    "Wear sunscreen SPF 30+. Seek shade during midday.",
+    "Protection essential. Sunscreen SPF 30+, hat, sunglasses.",
+    "Extra protection required. Avoid sun 10am-4pm.",
+    "Take all precautions. Avoid sun exposure if possible.",
+    "UV data not available for this period."
+)
+
+def uv_class(uv_index):
+    """Map UV index value(s) to indices into the _UV_* tables"""
+    uv = np.asarray(uv_index, dtype=float)
+    return np.where(np.isnan(uv), len(_UV_BINS) + 1, np.searchsorted(_UV_BINS, uv, side='right'))
+
 def get_uv_category(uv_index):
     """Get UV index category and color"""
-    if pd.isna(uv_index):
-        return "Unknown", "#718096", "❓"
-    if uv_index < 3:
-        return "Low", "#48bb78", "😊"
-    elif uv_index < 6:
-        return "Moderate", "#ed8936", "😐"
-    elif uv_index < 8:
-        return "High", "#dd6b20", "😰"
-    elif uv_index < 11:
-        return "Very High", "#c53030", "😱"
-    else:
-        return "Extreme", "#742a2a", "☠️"
+    idx = int(uv_class(uv_index))
+    return _UV_LABELS[idx], _UV_COLORS[idx], _UV_EMOJIS[idx]
 
 def get_uv_protection_advice(uv_index):
     """Get UV protection recommendations"""
-    if pd.isna(uv_index):
-        return "UV data not available for this period."
-    if uv_index < 3:
-        return "Minimal protection needed. Safe to be outside."
-    elif uv_index < 6:
-        return "Wear sunscreen SPF 30+. Seek shade during midday."
-    elif uv_index < 8:
-        return "Protection essential. Sunscreen SPF 30+, hat, sunglasses."
-    elif uv_index < 11:
-        return "Extra protection required. Avoid sun 10am-4pm."
+    return _UV_ADVICE[int(uv_class(uv_index))]
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def _enrich(raw_df):
+    """Add derived columns (dates, date labels, heat stress, moving averages) to the raw history"""
+    df = raw_df.copy()
+    # 'time' is already datetime64 (parsed once by the fetcher and cached)
+    df['date'] = df['time']
+    df['date_str'] = df['date'].dt.strftime('%Y-%m-%d')
+    
+    if 'apparent_temperature_max' in df.columns and 'temperature_2m_max' in df.columns:
+        df['heat_stress'] = df['apparent_temperature_max'] - df['temperature_2m_max']
+    
+    df['temp_ma7'] = df['temperature_2m_mean'].rolling(window=7, center=True).mean()
+    df['temp_ma30'] = df['temperature_2m_mean'].rolling(window=30, center=True).mean()
+    return df
+
+def _thin_for_plot(df, max_points=1000):
+    """Evenly subsample rows so time-series traces never ship more than max_points"""
+    if len(df) <= max_points:
+        return df
+    idx = np.linspace(0, len(df) - 1, max_points).astype(int)
+    return df.iloc[idx]
+
+def _thin_for_scatter(df, columns, max_points=500):
+    """Evenly subsample scatter rows above max_points, always keeping days in the top 5% of any plotted column"""
+    if len(df) <= max_points:
+        return df
+    idx = np.linspace(0, len(df) - 1, max_points).astype(int)
+    values = df[columns].to_numpy()
+    extreme_idx = np.flatnonzero((values >= np.nanpercentile(values, 95, axis=0)).any(axis=1))
+    return df.iloc[np.union1d(idx, extreme_idx)]
+
+# Cached figure builders: keyed on the enriched frame's content, so reruns with
+# unchanged data reuse the stored figures instead of rebuilding them.
+# Traces and layout go through the Figure constructor in one shot rather than
+# add_trace/update_layout, which re-validate the figure on every call.
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_uv_trend_figure(df):
+    """UV index trend with category thresholds"""
+    plot_df = _thin_for_plot(df)
+    fig = go.Figure(
+        data=[go.Scatter(
+            x=plot_df['date'],
+            y=plot_df['uv_index_max'],
+            name='UV Index',
+            fill='tozeroy',
+            line=dict(color='#ed8936', width=2)
+        )],
+        layout=dict(
+            **TIMESERIES_LAYOUT,
+            title='UV Index Trend',
+            yaxis_title='UV Index'
+        )
+    )
+    
+    # Add category thresholds
+    fig.add_hline(y=3, line_dash="dash", line_color="green", annotation_text="Low/Moderate")
+    fig.add_hline(y=6, line_dash="dash", line_color="orange", annotation_text="Moderate/High")
+    fig.add_hline(y=8, line_dash="dash", line_color="red", annotation_text="High/Very High")
+    fig.add_hline(y=11, line_dash="dash", line_color="darkred", annotation_text="Very High/Extreme")
+    return fig
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_uv_pie_figure(df):
+    """Share of days per UV category"""
+    uv_counts = np.bincount(uv_class(df['uv_index_max'].to_numpy()), minlength=len(_UV_LABELS))
+    
+    return go.Figure(
+        data=[go.Pie(
+            labels=_UV_LABELS,
+            values=uv_counts,
+            marker=dict(colors=_UV_COLORS)
+        )],
+        layout=dict(
+            title='UV Index Distribution',
+            height=400
+        )
+    )
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_heat_stress_figure(df):
+    """Apparent minus actual maximum temperature over time"""
+    plot_df = _thin_for_plot(df)
+    return go.Figure(
+        data=[go.Scatter(
+            x=plot_df['date'],
+            y=plot_df['heat_stress'],
+            name='Heat Stress',
+            fill='tozeroy',
+            line=dict(color='#e53e3e', width=2)
+        )],
+        layout=dict(
+            **TIMESERIES_LAYOUT,
+            title='Heat Stress (Apparent - Actual Temperature)',
+            yaxis_title='Temperature Difference (°C)'
+        )
+    )
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_comfort_figure(df):
+    """Actual vs feels-like temperature scatter"""
+    # Diagonal line (feels = actual)
+    min_temp = df['temperature_2m_mean'].min()
+    max_temp = df['temperature_2m_mean'].max()
+    
+    plot_df = _thin_for_scatter(df, ['temperature_2m_mean', 'apparent_temperature_max', 'heat_stress'])
+    
+    return go.Figure(
+        data=[
+            go.Scatter(
+                x=plot_df['temperature_2m_mean'],
+                y=plot_df['apparent_temperature_max'],
+                mode='markers',
+                marker=dict(
+                    size=8,
+                    color=plot_df['heat_stress'],
+                    colorscale='RdYlBu_r',
+                    showscale=True,
+                    colorbar=dict(title="Heat<br>Stress")
+                ),
+                text=plot_df['date_str'],
+                hovertemplate='<b>%{text}</b><br>Actual: %{x:.1f}°C<br>Feels: %{y:.1f}°C<extra></extra>'
+            ),
+            go.Scatter(
+                x=[min_temp, max_temp],
+                y=[min_temp, max_temp],
+                mode='lines',
+                line=dict(color='gray', dash='dash'),
+                name='Feels = Actual',
+                showlegend=True
+            )
+        ],
+        layout=dict(
+            title='Temperature vs Feels Like',
+            xaxis_title='Actual Temperature (°C)',
+            yaxis_title='Feels Like (°C)',
+            height=400
+        )
+    )
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_correlation_figure(df):
+    """Correlation heatmap of the available weather variables"""
+    # Select available columns for correlation
+    corr_columns = ['temperature_2m_mean', 'precipitation_sum', 'wind_speed_10m_max']
+    if 'uv_index_max' in df.columns:
+        corr_columns.append('uv_index_max')
+    if 'apparent_temperature_max' in df.columns:
+        corr_columns.append('apparent_temperature_max')
+    if 'wind_gusts_10m_max' in df.columns:
+        corr_columns.append('wind_gusts_10m_max')
+    
+    corr_values = df[corr_columns].to_numpy()
+    if np.isnan(corr_values).any():
+        # Pairwise-complete correlation when some days are missing values
+        corr_matrix = df[corr_columns].corr().to_numpy()
     else:
-        return "Take all precautions. Avoid sun exposure if possible."
+        corr_matrix = np.corrcoef(corr_values, rowvar=False)
+    
+    labels = [col.replace('_', ' ').title() for col in corr_columns]
+    
+    return go.Figure(
+        data=[go.Heatmap(
+            z=corr_matrix,
+            x=labels,
+            y=labels,
+            colorscale='RdBu',
+            zmid=0,
+            text=corr_matrix.round(3),
+            texttemplate='%{text}',
+            textfont={"size": 12},
+            colorbar=dict(title="Correlation")
+        )],
+        layout=dict(
+            title='Weather Variables Correlation Matrix',
+            height=500
+        )
+    )
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_scatter_figure(df):
+    """Temperature vs UV index, or vs precipitation when UV is unavailable"""
+    if 'uv_index_max' in df.columns:
+        plot_df = _thin_for_scatter(df, ['temperature_2m_max', 'uv_index_max', 'precipitation_sum'])
+        return go.Figure(
+            data=[go.Scatter(
+                x=plot_df['temperature_2m_max'],
+                y=plot_df['uv_index_max'],
+                mode='markers',
+                marker=dict(
+                    size=8,
+                    color=plot_df['precipitation_sum'],
+                    colorscale='Blues',
+                    showscale=True,
+                    colorbar=dict(title="Precip<br>(mm)")
+                ),
+                text=plot_df['date_str'],
+                hovertemplate='<b>%{text}</b><br>Temp: %{x:.1f}°C<br>UV: %{y:.1f}<extra></extra>'
+            )],
+            layout=dict(
+                title='Temperature vs UV Index',
+                xaxis_title='Max Temperature (°C)',
+                yaxis_title='UV Index',
+                height=500
+            )
+        )
+    
+    # Fallback to temp vs precipitation
+    plot_df = _thin_for_scatter(df, ['temperature_2m_mean', 'precipitation_sum', 'wind_speed_10m_max'])
+    return go.Figure(
+        data=[go.Scatter(
+            x=plot_df['temperature_2m_mean'],
+            y=plot_df['precipitation_sum'],
+            mode='markers',
+            marker=dict(
+                size=8,
+                color=plot_df['wind_speed_10m_max'],
+                colorscale='Viridis',
+                showscale=True,
+                colorbar=dict(title="Wind<br>(km/h)")
+            ),
+            text=plot_df['date_str'],
+            hovertemplate='<b>%{text}</b><br>Temp: %{x:.1f}°C<br>Precip: %{y:.1f}mm<extra></extra>'
+        )],
+        layout=dict(
+            title='Temperature vs Precipitation',
+            xaxis_title='Temperature (°C)',
+            yaxis_title='Precipitation (mm)',
+            height=500
+        )
+    )
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_trend_figure(df):
+    """Daily mean temperature with 7/30-day moving averages"""
+    plot_df = _thin_for_plot(df)
+    return go.Figure(
+        data=[
+            go.Scatter(
+                x=plot_df['date'],
+                y=plot_df['temperature_2m_mean'],
+                name='Daily Temperature',
+                line=dict(color='lightgray', width=1),
+                opacity=0.5
+            ),
+            go.Scatter(
+                x=plot_df['date'],
+                y=plot_df['temp_ma7'],
+                name='7-Day Moving Average',
+                line=dict(color='#4299e1', width=2)
+            ),
+            go.Scatter(
+                x=plot_df['date'],
+                y=plot_df['temp_ma30'],
+                name='30-Day Moving Average',
+                line=dict(color='#e53e3e', width=2)
+            )
+        ],
+        layout=dict(
+            **TIMESERIES_LAYOUT,
+            title='Temperature Trends with Moving Averages',
+            yaxis_title='Temperature (°C)'
+        )
+    )
+
+def _histogram_bar(values, bins, name, color):
+    """Bin values with NumPy and return (go.Bar trace, counts, bin edges), so only bar heights reach the browser"""
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=bins)
+    trace = go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        name=name,
+        marker_color=color,
+        opacity=0.7
+    )
+    return trace, counts, edges
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_temperature_histogram(df):
+    """Temperature histogram with a fitted normal curve"""
+    temps = df['temperature_2m_mean'].to_numpy()
+    bars, counts, edges = _histogram_bar(temps, 30, 'Temperature', '#4299e1')
+    
+    # Normal distribution overlay
+    mu = np.nanmean(temps)
+    sigma = np.nanstd(temps, ddof=1)
+    x_range = np.linspace(edges[0], edges[-1], 100)
+    # Gaussian PDF scaled to the histogram's counts
+    y_normal = (counts.sum() * (edges[1] - edges[0])) * \
+               np.exp(-0.5 * ((x_range - mu) / sigma) ** 2) / (sigma * np.sqrt(2 * np.pi))
+    
+    return go.Figure(
+        data=[
+            bars,
+            go.Scatter(
+                x=x_range,
+                y=y_normal,
+                name='Normal Distribution',
+                line=dict(color='red', width=2)
+            )
+        ],
+        layout=dict(
+            **HISTOGRAM_LAYOUT,
+            title='Temperature Distribution',
+            xaxis_title='Temperature (°C)'
+        )
+    )
+
+@st.cache_data(ttl=3600, max_entries=DATA_CACHE_SIZE, show_spinner=False)
+def build_secondary_histogram(df):
+    """UV index histogram, or rainy-day precipitation when UV is unavailable"""
+    if 'uv_index_max' in df.columns:
+        bars, _, _ = _histogram_bar(df['uv_index_max'].to_numpy(), 20, 'UV Index', '#ed8936')
+        return go.Figure(
+            data=[bars],
+            layout=dict(
+                **HISTOGRAM_LAYOUT,
+                title='UV Index Distribution',
+                xaxis_title='UV Index'
+            )
+        )
+    
+    # Precipitation distribution
+    precip = df['precipitation_sum'].to_numpy()
+    bars, _, _ = _histogram_bar(precip[precip > 0], 30, 'Precipitation', '#48bb78')
+    
+    return go.Figure(
+        data=[bars],
+        layout=dict(
+            **HISTOGRAM_LAYOUT,
+            title='Precipitation Distribution (Rainy Days Only)',
+            xaxis_title='Precipitation (mm)'
+        )
+    )
+
+# Percentiles listed in the percentile table (the 5th is also computed for the
+# cold-day threshold)
+PERCENTILES = [10, 25, 50, 75, 90, 95, 99]
+
+# Most recent (lat, lon, start, end) results kept in this user's session
+STATS_CACHE_SIZE = 3
+
+# Longest period the sidebar slider allows
+MAX_DAYS_BACK = 365
+
+def compute_statistics(lat, lon, start_str, end_str):
+    """Fetch the history and derive everything the page renders from it"""
+    # Always fetch the slider's full span ending at end_str, so moving the slider
+    # only slices the cached frame instead of going back to the API
+    full_start = datetime.strptime(end_str, '%Y-%m-%d') - timedelta(days=MAX_DAYS_BACK)
+    raw_df = cached_historical(lat, lon, full_start.strftime('%Y-%m-%d'), end_str)
+    if raw_df is None or len(raw_df) == 0:
+        return None
+    
+    raw_df = raw_df[raw_df['time'] >= pd.Timestamp(start_str)].reset_index(drop=True)
+    if len(raw_df) == 0:
+        return None
+    
+    # Derived columns are cached per dataset
+    df = _enrich(raw_df)
+    has_uv = 'uv_index_max' in df.columns
+    
+    # All percentiles used on this page in a single pass over the stacked columns
+    # (the 5th/95th rows also provide the extreme-event thresholds)
+    pct_columns = ['temperature_2m_mean', 'precipitation_sum', 'wind_speed_10m_max',
+                   'temperature_2m_max', 'temperature_2m_min']
+    if has_uv:
+        pct_columns.append('uv_index_max')
+    pct_table = pd.DataFrame(
+        np.nanpercentile(df[pct_columns].to_numpy(), [5] + PERCENTILES, axis=0),
+        index=[5] + PERCENTILES,
+        columns=pct_columns
+    )
+    
+    # Headline metrics for the summary section in one aggregation pass
+    summary = df[['temperature_2m_mean', 'precipitation_sum', 'wind_speed_10m_max']].agg(
+        ['mean', 'std', 'median', 'sum', 'max']
+    )
+    
+    figures = {
+        'correlation': build_correlation_figure(df),
+        'scatter': build_scatter_figure(df),
+        'trend': build_trend_figure(df),
+        'temperature_hist': build_temperature_histogram(df),
+        'secondary_hist': build_secondary_histogram(df)
+    }
+    if has_uv:
+        figures['uv_trend'] = build_uv_trend_figure(df)
+        figures['uv_pie'] = build_uv_pie_figure(df)
+    if 'heat_stress' in df.columns:
+        figures['heat_stress'] = build_heat_stress_figure(df)
+        figures['comfort'] = build_comfort_figure(df)
+    
+    return {'weather_df': df, 'summary': summary, 'pct_table': pct_table, 'figures': figures}
 
 # Header
 st.title("📈 Advanced Weather Statistics")
@@ -81,27 +498,38 @@ st.markdown("---")
 
 # Sidebar - Analysis period
 st.sidebar.markdown("### 📅 Analysis Period")
-days_back = st.sidebar.slider("Days of Historical Data", 30, 365, 90)
+days_back = st.sidebar.slider("Days of Historical Data", 30, MAX_DAYS_BACK, 90)
 
 end_date = datetime.now() - timedelta(days=1)
 start_date = end_date - timedelta(days=days_back)
 
-# Fetch data
-with st.spinner(f"Analyzing {days_back} days of weather data..."):
-    weather_df = get_historical_weather(
-        st.session_state['selected_lat'],
-        st.session_state['selected_lon'],
-        start_date.strftime('%Y-%m-%d'),
-        end_date.strftime('%Y-%m-%d')
-    )
+# Reuse this session's results when returning to a recent location/period,
+# which skips even the st.cache_data hashing of the frame and figures
+stats_key = (
+    round(st.session_state['selected_lat'], 3),
+    round(st.session_state['selected_lon'], 3),
+    start_date.strftime('%Y-%m-%d'),
+    end_date.strftime('%Y-%m-%d')
+)
+stats_cache = st.session_state.setdefault('_stats_cache', {})
+stats = stats_cache.get(stats_key)
 
-if weather_df is not None and len(weather_df) > 0:
-    # Process data
-    weather_df['date'] = pd.to_datetime(weather_df['time'])
-    
-    # Calculate additional metrics
-    if 'apparent_temperature_max' in weather_df.columns and 'temperature_2m_max' in weather_df.columns:
-        weather_df['heat_stress'] = weather_df['apparent_temperature_max'] - weather_df['temperature_2m_max']
+if stats is None:
+    # Fetch data
+    with st.spinner(f"Analyzing {days_back} days of weather data..."):
+        stats = compute_statistics(*stats_key)
+    
+    if stats is not None:
+        stats_cache[stats_key] = stats
+        # FIFO eviction keeps the session's memory bounded
+        while len(stats_cache) > STATS_CACHE_SIZE:
+            stats_cache.pop(next(iter(stats_cache)))
+
+if stats is not None:
+    weather_df = stats['weather_df']
+    summary = stats['summary']
+    pct_table = stats['pct_table']
+    figures = stats['figures']
     
     # Statistical Summary
     st.markdown("## 📊 Comprehensive Statistical Summary")
@@ -110,9 +538,9 @@ if weather_df is not None and len(weather_df) > 0:
     
     with col1:
         st.markdown("### 🌡️ Temperature")
-        temp_mean = weather_df['temperature_2m_mean'].mean()
-        temp_std = weather_df['temperature_2m_mean'].std()
-        temp_median = weather_df['temperature_2m_mean'].median()
+        temp_mean = summary.loc['mean', 'temperature_2m_mean']
+        temp_std = summary.loc['std', 'temperature_2m_mean']
+        temp_median = summary.loc['median', 'temperature_2m_mean']
         
         st.metric("Mean", f"{temp_mean:.1f}°C")
         st.metric("Std Dev", f"{temp_std:.2f}°C")
@@ -120,9 +548,9 @@ if weather_df is not None and len(weather_df) > 0:
     
     with col2:
         st.markdown("### 💧 Precipitation")
-        precip_total = weather_df['precipitation_sum'].sum()
-        precip_mean = weather_df['precipitation_sum'].mean()
-        precip_max = weather_df['precipitation_sum'].max()
+        precip_total = summary.loc['sum', 'precipitation_sum']
+        precip_mean = summary.loc['mean', 'precipitation_sum']
+        precip_max = summary.loc['max', 'precipitation_sum']
         
         st.metric("Total", f"{precip_total:.1f} mm")
         st.metric("Daily Avg", f"{precip_mean:.2f} mm")
@@ -130,9 +558,9 @@ if weather_df is not None and len(weather_df) > 0:
     
     with col3:
         st.markdown("### 🌬️ Wind Speed")
-        wind_mean = weather_df['wind_speed_10m_max'].mean()
-        wind_std = weather_df['wind_speed_10m_max'].std()
-        wind_max = weather_df['wind_speed_10m_max'].max()
+        wind_mean = summary.loc['mean', 'wind_speed_10m_max']
+        wind_std = summary.loc['std', 'wind_speed_10m_max']
+        wind_max = summary.loc['max', 'wind_speed_10m_max']
         
         st.metric("Mean", f"{wind_mean:.1f} km/h")
         st.metric("Std Dev", f"{wind_std:.2f} km/h")
@@ -164,50 +592,10 @@ if weather_df is not None and len(weather_df) > 0:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            # UV Index trend
-            fig_uv = go.Figure()
-            
-            fig_uv.add_trace(go.Scatter(
-                x=weather_df['date'],
-                y=weather_df['uv_index_max'],
-                name='UV Index',
-                fill='tozeroy',
-                line=dict(color='#ed8936', width=2)
-            ))
-            
-            # Add category thresholds
-            fig_uv.add_hline(y=3, line_dash="dash", line_color="green", annotation_text="Low/Moderate")
-            fig_uv.add_hline(y=6, line_dash="dash", line_color="orange", annotation_text="Moderate/High")
-            fig_uv.add_hline(y=8, line_dash="dash", line_color="red", annotation_text="High/Very High")
-            fig_uv.add_hline(y=11, line_dash="dash", line_color="darkred", annotation_text="Very High/Extreme")
-            
-            fig_uv.update_layout(
-                title='UV Index Trend',
-                xaxis_title='Date',
-                yaxis_title='UV Index',
-                height=400,
-                hovermode='x unified'
-            )
-            
-            st.plotly_chart(fig_uv, use_container_width=True)
+            st.plotly_chart(figures['uv_trend'], use_container_width=True)
         
         with col2:
-            # UV Index distribution
-            uv_categories = weather_df['uv_index_max'].apply(lambda x: get_uv_category(x)[0])
-            uv_counts = uv_categories.value_counts()
-            
-            fig_uv_pie = go.Figure(data=[go.Pie(
-                labels=uv_counts.index,
-                values=uv_counts.values,
-                marker=dict(colors=['#48bb78', '#ed8936', '#dd6b20', '#c53030', '#742a2a'])
-            )])
-            
-            fig_uv_pie.update_layout(
-                title='UV Index Distribution',
-                height=400
-            )
-            
-            st.plotly_chart(fig_uv_pie, use_container_width=True)
+            st.plotly_chart(figures['uv_pie'], use_container_width=True)
         
         # UV Protection Advice
         uv_data_for_advice = weather_df['uv_index_max'].dropna()
@@ -226,391 +614,132 @@ if weather_df is not None and len(weather_df) > 0:
         col1, col2 = st.columns(2)
         
         with col1:
-            # Heat stress trend
-            fig_heat = go.Figure()
-            
-            fig_heat.add_trace(go.Scatter(
-                x=weather_df['date'],
-                y=weather_df['heat_stress'],
-                name='Heat Stress',
-                fill='tozeroy',
-                line=dict(color='#e53e3e', width=2)
-            ))
-            
-            fig_heat.update_layout(
-                title='Heat Stress (Apparent - Actual Temperature)',
-                xaxis_title='Date',
-                yaxis_title='Temperature Difference (°C)',
-                height=400
-            )
-            
-            st.plotly_chart(fig_heat, use_container_width=True)
+            st.plotly_chart(figures['heat_stress'], use_container_width=True)
         
         with col2:
-            # Comfort scatter
-            fig_comfort = go.Figure()
-            
-            fig_comfort.add_trace(go.Scatter(
-                x=weather_df['temperature_2m_mean'],
-                y=weather_df['apparent_temperature_max'],
-                mode='markers',
-                marker=dict(
-                    size=8,
-                    color=weather_df['heat_stress'],
-                    colorscale='RdYlBu_r',
-                    showscale=True,
-                    colorbar=dict(title="Heat<br>Stress")
-                ),
-                text=weather_df['date'].dt.strftime('%Y-%m-%d'),
-                hovertemplate='<b>%{text}</b><br>Actual: %{x:.1f}°C<br>Feels: %{y:.1f}°C<extra></extra>'
-            ))
-            
-            # Add diagonal line (feels = actual)
-            min_temp = weather_df['temperature_2m_mean'].min()
-            max_temp = weather_df['temperature_2m_mean'].max()
-            fig_comfort.add_trace(go.Scatter(
-                x=[min_temp, max_temp],
-                y=[min_temp, max_temp],
-                mode='lines',
-                line=dict(color='gray', dash='dash'),
-                name='Feels = Actual',
-                showlegend=True
-            ))
-            
-            fig_comfort.update_layout(
-                title='Temperature vs Feels Like',
-                xaxis_title='Actual Temperature (°C)',
-                yaxis_title='Feels Like (°C)',
-                height=400
-            )
-            
-            st.plotly_chart(fig_comfort, use_container_width=True)
+            st.plotly_chart(figures['comfort'], use_container_width=True)
         
         st.markdown("---")
     
     # Enhanced Correlation Analysis
     st.markdown("## 🔗 Advanced Correlation Analysis")
     
-    # Select available columns for correlation
-    corr_columns = ['temperature_2m_mean', 'precipitation_sum', 'wind_speed_10m_max']
-    if 'uv_index_max' in weather_df.columns:
-        corr_columns.append('uv_index_max')
-    if 'apparent_temperature_max' in weather_df.columns:
-        corr_columns.append('apparent_temperature_max')
-    if 'wind_gusts_10m_max' in weather_df.columns:
-        corr_columns.append('wind_gusts_10m_max')
-    
-    corr_data = weather_df[corr_columns].corr()
-    
     col1, col2 = st.columns([1, 1])
     
     with col1:
-        # Correlation heatmap
-        fig_corr = go.Figure(data=go.Heatmap(
-            z=corr_data.values,
-            x=[col.replace('_', ' ').title() for col in corr_data.columns],
-            y=[col.replace('_', ' ').title() for col in corr_data.columns],
-            colorscale='RdBu',
-            zmid=0,
-            text=corr_data.values.round(3),
-            texttemplate='%{text}',
-            textfont={"size": 12},
-            colorbar=dict(title="Correlation")
-        ))
-        
-        fig_corr.update_layout(
-            title='Weather Variables Correlation Matrix',
-            height=500
-        )
-        
-        st.plotly_chart(fig_corr, use_container_width=True)
+        st.plotly_chart(figures['correlation'], use_container_width=True)
     
     with col2:
-        # Temperature vs UV Index (if available)
-        if 'uv_index_max' in weather_df.columns:
-            scatter_fig = go.Figure()
-            
-            scatter_fig.add_trace(go.Scatter(
-                x=weather_df['temperature_2m_max'],
-                y=weather_df['uv_index_max'],
-                mode='markers',
-                marker=dict(
-                    size=8,
-                    color=weather_df['precipitation_sum'],
-                    colorscale='Blues',
-                    showscale=True,
-                    colorbar=dict(title="Precip<br>(mm)")
-                ),
-                text=weather_df['date'].dt.strftime('%Y-%m-%d'),
-                hovertemplate='<b>%{text}</b><br>Temp: %{x:.1f}°C<br>UV: %{y:.1f}<extra></extra>'
-            ))
-            
-            scatter_fig.update_layout(
-                title='Temperature vs UV Index',
-                xaxis_title='Max Temperature (°C)',
-                yaxis_title='UV Index',
-                height=500
-            )
-            
-            st.plotly_chart(scatter_fig, use_container_width=True)
-        else:
-            # Fallback to temp vs precipitation
-            scatter_fig = go.Figure()
-            
-            scatter_fig.add_trace(go.Scatter(
-                x=weather_df['temperature_2m_mean'],
-                y=weather_df['precipitation_sum'],
-                mode='markers',
-                marker=dict(
-                    size=8,
-                    color=weather_df['wind_speed_10m_max'],
-                    colorscale='Viridis',
-                    showscale=True,
-                    colorbar=dict(title="Wind<br>(km/h)")
-                ),
-                text=weather_df['date'].dt.strftime('%Y-%m-%d'),
-                hovertemplate='<b>%{text}</b><br>Temp: %{x:.1f}°C<br>Precip: %{y:.1f}mm<extra></extra>'
-            ))
-            
-            scatter_fig.update_layout(
-                title='Temperature vs Precipitation',
-                xaxis_title='Temperature (°C)',
-                yaxis_title='Precipitation (mm)',
-                height=500
-            )
-            
-            st.plotly_chart(scatter_fig, use_container_width=True)
+        st.plotly_chart(figures['scatter'], use_container_width=True)
     
     st.markdown("---")
     
     # Time Series Decomposition
     st.markdown("## 📉 Temperature Trend Analysis")
     
-    # Calculate moving averages
-    weather_df['temp_ma7'] = weather_df['temperature_2m_mean'].rolling(window=7, center=True).mean()
-    weather_df['temp_ma30'] = weather_df['temperature_2m_mean'].rolling(window=30, center=True).mean()
-    
-    # Create trend chart
-    trend_fig = go.Figure()
-    
-    trend_fig.add_trace(go.Scatter(
-        x=weather_df['date'],
-        y=weather_df['temperature_2m_mean'],
-        name='Daily Temperature',
-        line=dict(color='lightgray', width=1),
-        opacity=0.5
-    ))
-    
-    trend_fig.add_trace(go.Scatter(
-        x=weather_df['date'],
-        y=weather_df['temp_ma7'],
-        name='7-Day Moving Average',
-        line=dict(color='#4299e1', width=2)
-    ))
-    
-    trend_fig.add_trace(go.Scatter(
-        x=weather_df['date'],
-        y=weather_df['temp_ma30'],
-        name='30-Day Moving Average',
-        line=dict(color='#e53e3e', width=2)
-    ))
-    
-    trend_fig.update_layout(
-        title='Temperature Trends with Moving Averages',
-        xaxis_title='Date',
-        yaxis_title='Temperature (°C)',
-        height=400,
-        hovermode='x unified'
-    )
-    
-    st.plotly_chart(trend_fig, use_container_width=True)
+    # Moving averages are computed in _enrich
+    st.plotly_chart(figures['trend'], use_container_width=True)
     
     st.markdown("---")
     
-    # Distribution Analysis
-    st.markdown("## 📊 Distribution Analysis")
-    
-    col1, col2 = st.columns(2)
+    # Distribution Analysis (collapsed by default)
+    with st.expander("📊 Distribution Analysis", expanded=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['temperature_hist'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['secondary_hist'], use_container_width=True)
     
-    with col1:
-        # Temperature distribution
-        temp_hist = go.Figure()
+    # Percentile Analysis (collapsed by default)
+    with st.expander("📏 Percentile Analysis", expanded=False):
+        cols = st.columns(4)
         
-        temp_hist.add_trace(go.Histogram(
-            x=weather_df['temperature_2m_mean'],
-            nbinsx=30,
-            name='Temperature',
-            marker_color='#4299e1',
-            opacity=0.7
-        ))
+        with cols[0]:
+            st.markdown("### Temperature")
+            for p in PERCENTILES:
+                st.markdown(f"**{p}th:** {pct_table.loc[p, 'temperature_2m_mean']:.1f}°C")
         
-        # Add normal distribution overlay
-        mu = weather_df['temperature_2m_mean'].mean()
-        sigma = weather_df['temperature_2m_mean'].std()
-        x_range = np.linspace(weather_df['temperature_2m_mean'].min(), 
-                             weather_df['temperature_2m_mean'].max(), 100)
-        y_normal = stats.norm.pdf(x_range, mu, sigma) * len(weather_df) * \
-                   (weather_df['temperature_2m_mean'].max() - weather_df['temperature_2m_mean'].min()) / 30
+        with cols[1]:
+            st.markdown("### Precipitation")
+            for p in PERCENTILES:
+                st.markdown(f"**{p}th:** {pct_table.loc[p, 'precipitation_sum']:.1f} mm")
         
-        temp_hist.add_trace(go.Scatter(
-            x=x_range,
-            y=y_normal,
-            name='Normal Distribution',
-            line=dict(color='red', width=2)
-        ))
+        with cols[2]:
+            st.markdown("### Wind Speed")
+            for p in PERCENTILES:
+                st.markdown(f"**{p}th:** {pct_table.loc[p, 'wind_speed_10m_max']:.1f} km/h")
         
-        temp_hist.update_layout(
-            title='Temperature Distribution',
-            xaxis_title='Temperature (°C)',
-            yaxis_title='Frequency',
-            height=350
-        )
+        with cols[3]:
+            if 'uv_index_max' in weather_df.columns:
+                st.markdown("### UV Index")
+                # Percentiles ignore days without UV data
+                if weather_df['uv_index_max'].notna().any():
+                    for p in PERCENTILES:
+                        st.markdown(f"**{p}th:** {pct_table.loc[p, 'uv_index_max']:.1f}")
+                else:
+                    st.markdown("*No UV data available*")
+    
+    # Extreme Events (collapsed by default)
+    with st.expander("⚡ Extreme Weather Events", expanded=False):
+        # Define thresholds
+        temp_high_threshold = pct_table.loc[95, 'temperature_2m_max']
+        temp_low_threshold = pct_table.loc[5, 'temperature_2m_min']
+        precip_threshold = pct_table.loc[95, 'precipitation_sum']
+        wind_threshold = pct_table.loc[95, 'wind_speed_10m_max']
         
-        st.plotly_chart(temp_hist, use_container_width=True)
-    
-    with col2:
-        # UV Index distribution (if available)
-        if 'uv_index_max' in weather_df.columns:
-            uv_hist = go.Figure()
-            
-            uv_hist.add_trace(go.Histogram(
-                x=weather_df['uv_index_max'],
-                nbinsx=20,
-                name='UV Index',
-                marker_color='#ed8936',
-                opacity=0.7
-            ))
-            
-            uv_hist.update_layout(
-                title='UV Index Distribution',
-                xaxis_title='UV Index',
-                yaxis_title='Frequency',
-                height=350
+        # Count extreme events (only the counts are shown, so no rows are copied)
+        n_hot = int(np.count_nonzero(weather_df['temperature_2m_max'].to_numpy() > temp_high_threshold))
+        n_cold = int(np.count_nonzero(weather_df['temperature_2m_min'].to_numpy() < temp_low_threshold))
+        n_rain = int(np.count_nonzero(weather_df['precipitation_sum'].to_numpy() > precip_threshold))
+        n_wind = int(np.count_nonzero(weather_df['wind_speed_10m_max'].to_numpy() > wind_threshold))
+        
+        cols = st.columns(4)
+        
+        with cols[0]:
+            st.metric(
+                "🔥 Hot Days",
+                n_hot,
+                delta=f">{temp_high_threshold:.1f}°C"
             )
-            
-            st.plotly_chart(uv_hist, use_container_width=True)
-        else:
-            # Precipitation distribution
-            precip_data = weather_df[weather_df['precipitation_sum'] > 0]['precipitation_sum']
-            
-            precip_hist = go.Figure()
-            
-            precip_hist.add_trace(go.Histogram(
-                x=precip_data,
-                nbinsx=30,
-                name='Precipitation',
-                marker_color='#48bb78',
-                opacity=0.7
-            ))
-            
-            precip_hist.update_layout(
-                title='Precipitation Distribution (Rainy Days Only)',
-                xaxis_title='Precipitation (mm)',
-                yaxis_title='Frequency',
-                height=350
+        
+        with cols[1]:
+            st.metric(
+                "❄️ Cold Days",
+                n_cold,
+                delta=f"<{temp_low_threshold:.1f}°C"
             )
-            
-            st.plotly_chart(precip_hist, use_container_width=True)
-    
-    st.markdown("---")
-    
-    # Percentile Analysis
-    st.markdown("## 📏 Percentile Analysis")
-    
-    cols = st.columns(4)
-    percentiles = [10, 25, 50, 75, 90, 95, 99]
-    
-    with cols[0]:
-        st.markdown("### Temperature")
-        temp_percentiles = np.percentile(weather_df['temperature_2m_mean'], percentiles)
-        for p, val in zip(percentiles, temp_percentiles):
-            st.markdown(f"**{p}th:** {val:.1f}°C")
-    
-    with cols[1]:
-        st.markdown("### Precipitation")
-        precip_percentiles = np.percentile(weather_df['precipitation_sum'], percentiles)
-        for p, val in zip(percentiles, precip_percentiles):
-            st.markdown(f"**{p}th:** {val:.1f} mm")
-    
-    with cols[2]:
-        st.markdown("### Wind Speed")
-        wind_percentiles = np.percentile(weather_df['wind_speed_10m_max'], percentiles)
-        for p, val in zip(percentiles, wind_percentiles):
-            st.markdown(f"**{p}th:** {val:.1f} km/h")
-    
-    with cols[3]:
-        if 'uv_index_max' in weather_df.columns:
-            st.markdown("### UV Index")
-            # Drop NaN values before calculating percentiles
-            uv_data = weather_df['uv_index_max'].dropna()
-            if len(uv_data) > 0:
-                uv_percentiles = np.percentile(uv_data, percentiles)
-                for p, val in zip(percentiles, uv_percentiles):
-                    st.markdown(f"**{p}th:** {val:.1f}")
-            else:
-                st.markdown("*No UV data available*")
-    
-    st.markdown("---")
-    
-    # Extreme Events
-    st.markdown("## ⚡ Extreme Weather Events")
-    
-    # Define thresholds
-    temp_high_threshold = np.percentile(weather_df['temperature_2m_max'], 95)
-    temp_low_threshold = np.percentile(weather_df['temperature_2m_min'], 5)
-    precip_threshold = np.percentile(weather_df['precipitation_sum'], 95)
-    wind_threshold = np.percentile(weather_df['wind_speed_10m_max'], 95)
-    
-    # Find extreme events
-    hot_days = weather_df[weather_df['temperature_2m_max'] > temp_high_threshold]
-    cold_days = weather_df[weather_df['temperature_2m_min'] < temp_low_threshold]
-    heavy_rain = weather_df[weather_df['precipitation_sum'] > precip_threshold]
-    windy_days = weather_df[weather_df['wind_speed_10m_max'] > wind_threshold]
-    
-    cols = st.columns(4)
-    
-    with cols[0]:
-        st.metric(
-            "🔥 Hot Days",
-            len(hot_days),
-            delta=f">{temp_high_threshold:.1f}°C"
-        )
-    
-    with cols[1]:
-        st.metric(
-            "❄️ Cold Days",
-            len(cold_days),
-            delta=f"<{temp_low_threshold:.1f}°C"
-        )
-    
-    with cols[2]:
-        st.metric(
-            "🌧️ Heavy Rain Days",
-            len(heavy_rain),
-            delta=f">{precip_threshold:.1f}mm"
-        )
-    
-    with cols[3]:
-        st.metric(
-            "💨 Windy Days",
-            len(windy_days),
-            delta=f">{wind_threshold:.1f}km/h"
-        )
-    
-    # High UV days
-    if 'uv_index_max' in weather_df.columns:
-        # Filter out NaN values
-        high_uv_days = weather_df[weather_df['uv_index_max'].notna() & (weather_df['uv_index_max'] >= 8)]
-        total_days_with_uv = len(weather_df[weather_df['uv_index_max'].notna()])
         
-        if total_days_with_uv > 0:
+        with cols[2]:
             st.metric(
-                "☀️ High UV Days (≥8)",
-                len(high_uv_days),
-                delta=f"{(len(high_uv_days)/total_days_with_uv*100):.1f}% of days with UV data"
+                "🌧️ Heavy Rain Days",
+                n_rain,
+                delta=f">{precip_threshold:.1f}mm"
             )
-        else:
-            st.info("UV data not available for this period")
+        
+        with cols[3]:
+            st.metric(
+                "💨 Windy Days",
+                n_wind,
+                delta=f">{wind_threshold:.1f}km/h"
+            )
+        
+        # High UV days
+        if 'uv_index_max' in weather_df.columns:
+            # NaN compares False, so days without UV data are never counted as high
+            uv_values = weather_df['uv_index_max'].to_numpy()
+            n_high_uv = int(np.count_nonzero(uv_values >= 8))
+            total_days_with_uv = int(np.count_nonzero(~np.isnan(uv_values)))
+            
+            if total_days_with_uv > 0:
+                st.metric(
+                    "☀️ High UV Days (≥8)",
+                    n_high_uv,
+                    delta=f"{(n_high_uv/total_days_with_uv*100):.1f}% of days with UV data"
+                )
+            else:
+                st.info("UV data not available for this period")
     
     st.markdown("---")
     
@@ -14,7 +14,7 @@ from datetime import datetime, timedelta
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from utils.weather_api import get_hourly_forecast, get_daily_forecast
+from utils.cached_api import cached_hourly
 
 # Page configuration
 st.set_page_config(
@@ -23,6 +23,120 @@ st.set_page_config(
     layout="wide"
 )
 
+# Radar grid resolution and half-width in degrees (~111km)
+RADAR_GRID_SIZE = 100
+RADAR_RANGE = 1.0
+
+# Radar heatmap colours, transparent for no rain up to dark red for extreme
+RADAR_COLORSCALE = [
+    [0, 'rgba(255, 255, 255, 0)'],      # Transparent (no rain)
+    [0.05, 'rgba(144, 238, 144, 0.3)'], # Light green (drizzle)
+    [0.15, 'rgba(135, 206, 250, 0.5)'], # Light blue (light rain)
+    [0.30, 'rgba(65, 105, 225, 0.7)'],  # Royal blue (moderate rain)
+    [0.50, 'rgba(255, 215, 0, 0.8)'],   # Gold (heavy rain)
+    [0.70, 'rgba(255, 140, 0, 0.9)'],   # Dark orange (very heavy)
+    [0.85, 'rgba(255, 69, 0, 0.95)'],   # Red orange (intense)
+    [1.0, 'rgba(139, 0, 0, 1)']         # Dark red (extreme)
+]
+
+# Static part of the radar map's geo layout; center and ranges are added per location
+RADAR_GEO = dict(
+    scope='world',
+    projection_type='mercator',
+    showland=True,
+    landcolor='rgb(243, 243, 243)',
+    coastlinecolor='rgb(204, 204, 204)',
+    showlakes=True,
+    lakecolor='rgb(220, 240, 255)',
+    showcountries=True,
+    countrycolor='rgb(180, 180, 180)',
+    bgcolor='rgba(0,0,0,0)'
+)
+
+# Radar intensity scale legend
+INTENSITY_LEVELS = [
+    {"range": "0 - 0.5", "color": "#90EE90", "label": "Drizzle", "emoji": "💧"},
+    {"range": "0.5 - 2.5", "color": "#87CEEB", "label": "Light Rain", "emoji": "🌧️"},
+    {"range": "2.5 - 10", "color": "#4169E1", "label": "Moderate Rain", "emoji": "🌧️"},
+    {"range": "10 - 25", "color": "#FFD700", "label": "Heavy Rain", "emoji": "⛈️"},
+    {"range": "25 - 50", "color": "#FF8C00", "label": "Very Heavy Rain", "emoji": "⛈️"},
+    {"range": "> 50", "color": "#FF4500", "label": "Extreme Rain", "emoji": "🌊"}
+]
+
+# The whole legend as one HTML block, so it renders with a single st.markdown call
+INTENSITY_LEGEND_HTML = "".join(
+    f'<div style="display: flex; align-items: center; margin: 0.5rem 0; padding: 0.5rem; '
+    f'background: linear-gradient(90deg, {level["color"]}33, transparent); '
+    f'border-left: 4px solid {level["color"]}; border-radius: 4px;">'
+    f'<span style="font-size: 1.5rem; margin-right: 1rem;">{level["emoji"]}</span>'
+    f'<div><strong>{level["label"]}</strong>'
+    f'<span style="color: #666; margin-left: 1rem;">{level["range"]} mm/h</span></div>'
+    '</div>'
+    for level in INTENSITY_LEVELS
+)
+
+# Shared layout for the hourly time-series charts on this page
+TIMESERIES_LAYOUT = dict(
+    hovermode='x unified',
+    showlegend=False
+)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_radar_grid(lat, lon, base_precip, precip_prob, hour):
+    """
+    Synthesize the precipitation intensity grid around a location
+    
+    The pattern is seeded from the hour, so it stays put across reruns within
+    that hour instead of reshuffling on every widget interaction.
+    
+    Returns:
+        (lat_range, lon_range, float32 precipitation grid)
+    """
+    grid_size = RADAR_GRID_SIZE
+    
+    lat_range = np.linspace(lat - RADAR_RANGE, lat + RADAR_RANGE, grid_size)
+    lon_range = np.linspace(lon - RADAR_RANGE, lon + RADAR_RANGE, grid_size)
+    
+    # Create precipitation intensity grid with realistic patterns
+    rng = np.random.default_rng(hour)
+    
+    # Generate realistic precipitation cells
+    precip_grid = np.zeros((grid_size, grid_size))
+    
+    if base_precip > 0 or precip_prob > 0.3:
+        # Create multiple precipitation cells
+        num_cells = rng.integers(2, 6)
+        
+        # Row/column index grids, broadcast against each other per cell
+        rows, cols = np.ogrid[:grid_size, :grid_size]
+        
+        for _ in range(num_cells):
+            # Random cell center
+            center_lat = rng.integers(20, 80)
+            center_lon = rng.integers(20, 80)
+            
+            # Cell intensity and size
+            intensity = base_precip * rng.uniform(0.5, 2.0) * precip_prob
+            size = rng.uniform(15, 35)
+            
+            # Only the cell's bounding box can fall inside its radius, so the
+            # temporaries scale with the cell rather than the whole grid
+            reach = int(np.ceil(size))
+            i0, i1 = max(center_lat - reach, 0), min(center_lat + reach + 1, grid_size)
+            j0, j1 = max(center_lon - reach, 0), min(center_lon + reach + 1, grid_size)
+            
+            # Create Gaussian-like precipitation cell (squared distances, no sqrt needed)
+            dist2 = (rows[i0:i1] - center_lat)**2 + (cols[:, j0:j1] - center_lon)**2
+            cell = intensity * np.exp(-dist2 / (2 * (size/3)**2))
+            precip_grid[i0:i1, j0:j1] += np.where(dist2 < size**2, cell, 0.0)
+    
+    # Add some noise for realism
+    noise = rng.random((grid_size, grid_size), dtype=np.float32) * 0.1
+    precip_grid += noise
+    precip_grid = np.maximum(precip_grid, 0)  # No negative values
+    
+    return lat_range, lon_range, precip_grid.astype(np.float32)
+
 # Header
 st.title("📡 Radar Cuaca Interaktif")
 st.markdown("**Visualisasi intensitas hujan dan prakiraan cuaca real-time**")
@@ -39,19 +153,17 @@ st.markdown("---")
 
 # Fetch forecast data
 with st.spinner("Loading radar data..."):
-    hourly_forecast = get_hourly_forecast(
+    hourly_forecast = cached_hourly(
         st.session_state['selected_lat'],
         st.session_state['selected_lon'],
         hours=48
     )
-    
-    daily_forecast = get_daily_forecast(
-        st.session_state['selected_lat'],
-        st.session_state['selected_lon'],
-        days=7
-    )
 
 if hourly_forecast is not None and len(hourly_forecast) > 0:
+    # Open-Meteo values carry one decimal, so float32 is plenty and halves the chart payloads
+    float_cols = hourly_forecast.select_dtypes('float64').columns
+    hourly_forecast[float_cols] = hourly_forecast[float_cols].astype('float32')
+    
     # Current conditions
     current = hourly_forecast.iloc[0]
     
@@ -102,131 +214,83 @@ if hourly_forecast is not None and len(hourly_forecast) > 0:
     lat = st.session_state['selected_lat']
     lon = st.session_state['selected_lon']
     
-    # Generate radar grid (higher resolution)
-    grid_size = 100
-    radar_range = 1.0  # degrees (~111km)
-    
-    lat_range = np.linspace(lat - radar_range, lat + radar_range, grid_size)
-    lon_range = np.linspace(lon - radar_range, lon + radar_range, grid_size)
-    
-    # Create precipitation intensity grid with realistic patterns
-    np.random.seed(int(datetime.now().timestamp()) % 1000)
-    
     # Base precipitation from current data
-    base_precip = current.get('precipitation', 0)
-    precip_prob = current.get('precipitation_probability', 0) / 100
-    
-    # Generate realistic precipitation cells
-    precip_grid = np.zeros((grid_size, grid_size))
-    
-    if base_precip > 0 or precip_prob > 0.3:
-        # Create multiple precipitation cells
-        num_cells = np.random.randint(2, 6)
+    base_precip = float(current.get('precipitation', 0))
+    precip_prob = float(current.get('precipitation_probability', 0)) / 100
+    
+    if base_precip < 0.05 and precip_prob < 0.2:
+        # Dry conditions: nothing to show, so skip the grid build and heatmap payload
+        st.info("☀️ Tidak ada hujan aktif di sekitar lokasi — radar dalam keadaan idle")
+    else:
+        # Grid is built once per location and hour, then served from cache on reruns
+        lat_range, lon_range, precip_grid = build_radar_grid(
+            lat, lon, base_precip, precip_prob,
+            int(datetime.now().timestamp()) // 3600
+        )
         
-        for _ in range(num_cells):
-            # Random cell center
-            center_lat = np.random.randint(20, 80)
-            center_lon = np.random.randint(20, 80)
-            
-            # Cell intensity and size
-            intensity = base_precip * np.random.uniform(0.5, 2.0) * precip_prob
-            size = np.random.uniform(15, 35)
-            
-            # Create Gaussian-like precipitation cell
-            for i in range(grid_size):
-                for j in range(grid_size):
-                    dist = np.sqrt((i - center_lat)**2 + (j - center_lon)**2)
-                    if dist < size:
-                        cell_value = intensity * np.exp(-(dist**2) / (2 * (size/3)**2))
-                        precip_grid[i, j] += cell_value
-    
-    # Add some noise for realism
-    noise = np.random.random((grid_size, grid_size)) * 0.1
-    precip_grid += noise
-    precip_grid = np.maximum(precip_grid, 0)  # No negative values
-    
-    # Create professional radar visualization
-    fig_radar = go.Figure()
-    
-    # Add precipitation layer
-    fig_radar.add_trace(go.Heatmap(
-        z=precip_grid,
-        x=lon_range,
-        y=lat_range,
-        colorscale=[
-            [0, 'rgba(255, 255, 255, 0)'],      # Transparent (no rain)
-            [0.05, 'rgba(144, 238, 144, 0.3)'], # Light green (drizzle)
-            [0.15, 'rgba(135, 206, 250, 0.5)'], # Light blue (light rain)
-            [0.30, 'rgba(65, 105, 225, 0.7)'],  # Royal blue (moderate rain)
-            [0.50, 'rgba(255, 215, 0, 0.8)'],   # Gold (heavy rain)
-            [0.70, 'rgba(255, 140, 0, 0.9)'],   # Dark orange (very heavy)
-            [0.85, 'rgba(255, 69, 0, 0.95)'],   # Red orange (intense)
-            [1.0, 'rgba(139, 0, 0, 1)']         # Dark red (extreme)
-        ],
-        colorbar=dict(
-            title="Intensitas<br>(mm/jam)",
-            tickmode="linear",
-            tick0=0,
-            dtick=2,
-            len=0.7
-        ),
-        hovertemplate='Lat: %{y:.3f}<br>Lon: %{x:.3f}<br>Intensitas: %{z:.2f} mm/jam<extra></extra>',
-        showscale=True
-    ))
-    
-    # Add location marker
-    fig_radar.add_trace(go.Scattergeo(
-        lon=[lon],
-        lat=[lat],
-        mode='markers+text',
-        marker=dict(
-            size=15,
-            color='red',
-            symbol='circle',
-            line=dict(width=2, color='white')
-        ),
-        text=['📍'],
-        textfont=dict(size=20),
-        showlegend=False,
-        hovertemplate='<b>Lokasi Anda</b><br>Lat: %{lat:.3f}<br>Lon: %{lon:.3f}<extra></extra>'
-    ))
-    
-    # Update layout for professional look
-    fig_radar.update_layout(
-        title={
-            'text': 'Peta Intensitas Hujan',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 20, 'color': '#2c3e50'}
-        },
-        geo=dict(
-            scope='world',
-            projection_type='mercator',
-            center=dict(lat=lat, lon=lon),
-            lonaxis=dict(range=[lon - radar_range, lon + radar_range]),
-            lataxis=dict(range=[lat - radar_range, lat + radar_range]),
-            showland=True,
-            landcolor='rgb(243, 243, 243)',
-            coastlinecolor='rgb(204, 204, 204)',
-            showlakes=True,
-            lakecolor='rgb(220, 240, 255)',
-            showcountries=True,
-            countrycolor='rgb(180, 180, 180)',
-            bgcolor='rgba(0,0,0,0)'
-        ),
-        height=600,
-        margin=dict(l=0, r=0, t=50, b=0)
-    )
-    
-    st.plotly_chart(fig_radar, use_container_width=True)
+        # Create professional radar visualization
+        fig_radar = go.Figure()
+        
+        # Add precipitation layer
+        fig_radar.add_trace(go.Heatmap(
+            z=precip_grid,
+            x=lon_range,
+            y=lat_range,
+            colorscale=RADAR_COLORSCALE,
+            colorbar=dict(
+                title="Intensitas<br>(mm/jam)",
+                tickmode="linear",
+                tick0=0,
+                dtick=2,
+                len=0.7
+            ),
+            hovertemplate='Lat: %{y:.3f}<br>Lon: %{x:.3f}<br>Intensitas: %{z:.2f} mm/jam<extra></extra>',
+            showscale=True
+        ))
+        
+        # Add location marker
+        fig_radar.add_trace(go.Scattergeo(
+            lon=[lon],
+            lat=[lat],
+            mode='markers+text',
+            marker=dict(
+                size=15,
+                color='red',
+                symbol='circle',
+                line=dict(width=2, color='white')
+            ),
+            text=['📍'],
+            textfont=dict(size=20),
+            showlegend=False,
+            hovertemplate='<b>Lokasi Anda</b><br>Lat: %{lat:.3f}<br>Lon: %{lon:.3f}<extra></extra>'
+        ))
+        
+        # Update layout for professional look
+        fig_radar.update_layout(
+            title={
+                'text': 'Peta Intensitas Hujan',
+                'x': 0.5,
+                'xanchor': 'center',
+                'font': {'size': 20, 'color': '#2c3e50'}
+            },
+            geo=dict(
+                RADAR_GEO,
+                center=dict(lat=lat, lon=lon),
+                lonaxis=dict(range=[lon - RADAR_RANGE, lon + RADAR_RANGE]),
+                lataxis=dict(range=[lat - RADAR_RANGE, lat + RADAR_RANGE])
+            ),
+            height=600,
+            margin=dict(l=0, r=0, t=50, b=0)
+        )
+        
+        st.plotly_chart(fig_radar, use_container_width=True)
     
     st.markdown("---")
     
     # Precipitation Forecast Timeline
     st.markdown("## ⏱️ Prakiraan Hujan 48 Jam")
     
-    # Prepare hourly data
-    hourly_forecast['time'] = pd.to_datetime(hourly_forecast['time'])
+    # Prepare hourly data ('time' is already datetime64 from the cached fetch)
     hourly_forecast['hour'] = hourly_forecast['time'].dt.strftime('%H:%M')
     
     # Create forecast chart
@@ -282,9 +346,8 @@ if hourly_forecast is not None and len(hourly_forecast) > 0:
     fig_forecast.update_yaxes(title_text="Kemungkinan (%)", range=[0, 100], row=2, col=1)
     
     fig_forecast.update_layout(
+        **TIMESERIES_LAYOUT,
         height=600,
-        hovermode='x unified',
-        showlegend=False,
         title={
             'text': 'Prakiraan Hujan Detail',
             'x': 0.5,
@@ -303,39 +366,17 @@ if hourly_forecast is not None and len(hourly_forecast) > 0:
     
     with col1:
         # Create intensity scale visualization
-        intensity_levels = [
-            {"range": "0 - 0.5", "color": "#90EE90", "label": "Drizzle", "emoji": "💧"},
-            {"range": "0.5 - 2.5", "color": "#87CEEB", "label": "Light Rain", "emoji": "🌧️"},
-            {"range": "2.5 - 10", "color": "#4169E1", "label": "Moderate Rain", "emoji": "🌧️"},
-            {"range": "10 - 25", "color": "#FFD700", "label": "Heavy Rain", "emoji": "⛈️"},
-            {"range": "25 - 50", "color": "#FF8C00", "label": "Very Heavy Rain", "emoji": "⛈️"},
-            {"range": "> 50", "color": "#FF4500", "label": "Extreme Rain", "emoji": "🌊"}
-        ]
-        
-        for level in intensity_levels:
-            st.markdown(
-                f"""
-                <div style="display: flex; align-items: center; margin: 0.5rem 0; padding: 0.5rem; 
-                            background: linear-gradient(90deg, {level['color']}33, transparent); 
-                            border-left: 4px solid {level['color']}; border-radius: 4px;">
-                    <span style="font-size: 1.5rem; margin-right: 1rem;">{level['emoji']}</span>
-                    <div>
-                        <strong>{level['label']}</strong>
-                        <span style="color: #666; margin-left: 1rem;">{level['range']} mm/h</span>
-                    </div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+        st.markdown(INTENSITY_LEGEND_HTML, unsafe_allow_html=True)
     
     with col2:
         st.markdown("### 📊 Statistik Saat Ini")
         
-        # Calculate statistics
-        next_24h = hourly_forecast.head(24)
-        total_precip_24h = next_24h['precipitation'].sum()
-        max_intensity = next_24h['precipitation'].max()
-        avg_prob = next_24h['precipitation_probability'].mean()
+        # Calculate statistics over the next 24 hours (array views, no frame copies)
+        precip_24h = hourly_forecast['precipitation'].to_numpy()[:24]
+        prob_24h = hourly_forecast['precipitation_probability'].to_numpy()[:24]
+        total_precip_24h = np.nansum(precip_24h)
+        max_intensity = np.nanmax(precip_24h)
+        avg_prob = np.nanmean(prob_24h)
         
         st.metric("Total 24 Jam", f"{total_precip_24h:.1f} mm")
         st.metric("Intensitas Maks", f"{max_intensity:.1f} mm/jam")
@@ -392,9 +433,8 @@ if hourly_forecast is not None and len(hourly_forecast) > 0:
     fig_atmos.update_yaxes(title_text="Jarak (km)", row=1, col=2)
     
     fig_atmos.update_layout(
-        height=400,
-        showlegend=False,
-        hovermode='x unified'
+        **TIMESERIES_LAYOUT,
+        height=400
     )
     
     st.plotly_chart(fig_atmos, use_container_width=True)
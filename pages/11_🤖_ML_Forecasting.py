@@ -10,12 +10,14 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from utils.weather_api import get_historical_weather, get_daily_forecast
+from utils.cached_api import cached_historical, cached_daily
 from utils.ml_forecasting import (
     train_arima, train_prophet, train_lstm, train_xgboost,
     calculate_metrics, ensemble_forecast
@@ -28,6 +30,92 @@ st.set_page_config(
     layout="wide"
 )
 
+# Shared axes for the temperature forecast charts on this page
+FORECAST_LAYOUT = dict(
+    xaxis_title='Date',
+    yaxis_title='Temperature (°C)'
+)
+
+# Utility functions
+def _api_mean_temps(api_forecast, n):
+    """
+    Daily mean temperatures from the API forecast as a NumPy array
+    
+    Uses temperature_2m_mean when present, else the max/min midpoint, else the
+    first temperature column. Returns None when no temperature data is available.
+    """
+    if api_forecast is None or len(api_forecast) == 0:
+        return None
+    
+    if 'temperature_2m_mean' in api_forecast.columns:
+        temps = api_forecast['temperature_2m_mean'].to_numpy()
+    elif 'temperature_2m_max' in api_forecast.columns and 'temperature_2m_min' in api_forecast.columns:
+        # Calculate mean from max and min
+        temps = (api_forecast['temperature_2m_max'].to_numpy() + api_forecast['temperature_2m_min'].to_numpy()) / 2
+    else:
+        # Fallback to first temperature column found
+        temp_cols = [col for col in api_forecast.columns if 'temperature' in col.lower()]
+        if not temp_cols:
+            return None
+        temps = api_forecast[temp_cols[0]].to_numpy()
+    
+    temps = np.asarray(temps[:n], dtype=float)
+    return temps if len(temps) > 0 else None
+
+TRAINERS = {
+    'ARIMA': train_arima,
+    'Prophet': train_prophet,
+    'LSTM': train_lstm,
+    'XGBoost': train_xgboost
+}
+
+class _TrainingFailed(Exception):
+    """Raised inside train_cached so a failed fit (None) is not cached"""
+
+# cache_resource rather than cache_data: results hold fitted Keras/Prophet/statsmodels
+# models, which don't pickle. Arguments are hashed by content, so clicking Train
+# again with the same location, history and horizon reuses the earlier fit
+@st.cache_resource(max_entries=32, show_spinner=False)
+def train_cached(model_name, data, forecast_days, _trained=None):
+    """
+    Train one model (cached)
+    
+    Args:
+        model_name: Key into TRAINERS
+        data: Training input for that model
+        forecast_days: Number of days to forecast
+        _trained: Optional list, appended to only when the model is actually fitted
+            (the leading underscore keeps it out of the cache key)
+    
+    Returns:
+        Result dict from the trainer
+    
+    Raises:
+        _TrainingFailed: If the trainer returned None
+    """
+    if _trained is not None:
+        _trained.append(model_name)
+    
+    result = TRAINERS[model_name](data, forecast_days)
+    if result is None:
+        raise _TrainingFailed
+    return result
+
+def train_model(model_name, data, forecast_days):
+    """
+    Train one model through the cache and time it
+    
+    Returns:
+        (result dict, training time in seconds or None when reused from the cache)
+    
+    Raises:
+        _TrainingFailed: If the trainer returned None
+    """
+    trained = []
+    start_time = time.time()
+    result = train_cached(model_name, data, forecast_days, _trained=trained)
+    return result, (time.time() - start_time if trained else None)
+
 # Header
 st.title("🤖 ML Weather Forecasting")
 st.markdown("**Compare machine learning models with API forecasts**")
@@ -66,7 +154,7 @@ if train_button:
         end_date = datetime.now() - timedelta(days=1)
         start_date = end_date - timedelta(days=historical_days)
         
-        historical_df = get_historical_weather(
+        historical_df = cached_historical(
             st.session_state['selected_lat'],
             st.session_state['selected_lon'],
             start_date.strftime('%Y-%m-%d'),
@@ -74,16 +162,22 @@ if train_button:
         )
         
         # Get API forecast for comparison
-        api_forecast = get_daily_forecast(
+        api_forecast = cached_daily(
             st.session_state['selected_lat'],
             st.session_state['selected_lon'],
             days=forecast_days
         )
     
     if historical_df is not None and len(historical_df) > 30:
-        historical_df['date'] = pd.to_datetime(historical_df['time'])
+        # 'time' is already datetime64 from the fetcher
+        historical_df['date'] = historical_df['time']
         temperature_data = historical_df['temperature_2m_mean'].values
         
+        # API forecast temperatures, resolved once for the charts, metrics and export
+        api_temps_array = _api_mean_temps(api_forecast, forecast_days)
+        if api_temps_array is not None:
+            api_dates = api_forecast['time'].iloc[:len(api_temps_array)]
+        
         st.success(f"✅ Loaded {len(historical_df)} days of historical data")
         
         # Results storage
@@ -103,32 +197,53 @@ if train_button:
         
         total_models = len(models_to_train)
         
-        for idx, model_name in enumerate(models_to_train):
-            status_text.markdown(f"**Training {model_name}...**")
-            start_time = time.time()
+        model_inputs = {
+            'ARIMA': temperature_data,
+            'Prophet': historical_df,
+            'LSTM': temperature_data,
+            'XGBoost': historical_df
+        }
+        
+        # The models are independent and spend their time in native code
+        # (statsmodels/BLAS, cmdstan, TensorFlow, XGBoost) that releases the GIL,
+        # so threads overlap them. Processes don't fit here: Streamlit runs the
+        # page as __main__, which spawned workers would re-execute. Each worker
+        # gets this run's ScriptRunContext, which st.cache_resource expects;
+        # the workers never write page elements, only the main thread does
+        status_text.markdown(f"**Training {', '.join(models_to_train)}...**")
+        with ThreadPoolExecutor(
+            max_workers=max(total_models, 1),
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx())
+        ) as executor:
+            futures = {
+                executor.submit(train_model, model_name, model_inputs[model_name], forecast_days): model_name
+                for model_name in models_to_train
+            }
             
-            try:
-                if model_name == 'ARIMA':
-                    result = train_arima(temperature_data, forecast_days)
-                elif model_name == 'Prophet':
-                    result = train_prophet(historical_df, forecast_days)
-                elif model_name == 'LSTM':
-                    result = train_lstm(temperature_data, forecast_days)
-                elif model_name == 'XGBoost':
-                    result = train_xgboost(historical_df, forecast_days)
+            for done, future in enumerate(as_completed(futures), start=1):
+                model_name = futures[future]
                 
-                if result:
+                try:
+                    result, elapsed = future.result()
+                    
                     results[model_name] = result
-                    training_times[model_name] = time.time() - start_time
-                    status_text.markdown(f"✅ **{model_name} trained** ({training_times[model_name]:.1f}s)")
-                else:
+                    training_times[model_name] = elapsed
+                    if elapsed is None:
+                        status_text.markdown(f"♻️ **{model_name} reused** (cached)")
+                    else:
+                        status_text.markdown(f"✅ **{model_name} trained** ({elapsed:.1f}s)")
+                
+                except _TrainingFailed:
                     status_text.markdown(f"❌ **{model_name} failed**")
-            
-            except Exception as e:
-                st.error(f"Error training {model_name}: {str(e)}")
-            
-            progress_bar.progress((idx + 1) / total_models)
-            time.sleep(0.5)
+                
+                except Exception as e:
+                    st.error(f"Error training {model_name}: {str(e)}")
+                
+                progress_bar.progress(done / total_models)
+        
+        # Keep the sidebar order rather than completion order for charts and tables
+        results = {name: results[name] for name in models_to_train if name in results}
         
         status_text.markdown("✅ **All models trained successfully!**")
         
@@ -139,7 +254,11 @@ if train_button:
         
         # Create forecast dates
         last_date = historical_df['date'].max()
-        forecast_dates = [last_date + timedelta(days=i+1) for i in range(forecast_days)]
+        forecast_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), periods=forecast_days, freq='D')
+        
+        # x for the confidence-interval polygons: forward along the upper bound, back along the lower
+        forecast_dates_arr = forecast_dates.to_numpy()
+        ci_dates = np.concatenate([forecast_dates_arr, forecast_dates_arr[::-1]])
         
         # Create comparison chart
         fig = go.Figure()
@@ -160,6 +279,10 @@ if train_button:
             'LSTM': '#9f7aea',
             'XGBoost': '#ed8936'
         }
+        ci_colors = {
+            name: f"rgba({int(color[1:3], 16)}, {int(color[3:5], 16)}, {int(color[5:7], 16)}, 0.2)"
+            for name, color in colors.items()
+        }
         
         for model_name, result in results.items():
             # Main forecast line
@@ -173,46 +296,28 @@ if train_button:
             
             # Confidence interval
             fig.add_trace(go.Scatter(
-                x=forecast_dates + forecast_dates[::-1],
-                y=list(result['upper_bound']) + list(result['lower_bound'][::-1]),
+                x=ci_dates,
+                y=np.concatenate([result['upper_bound'], result['lower_bound'][::-1]]),
                 fill='toself',
-                fillcolor=colors.get(model_name, '#000').replace('1', '0.2'),
+                fillcolor=ci_colors.get(model_name, 'rgba(0, 0, 0, 0.2)'),
                 line=dict(color='rgba(255,255,255,0)'),
                 showlegend=False,
                 name=f'{model_name} CI'
             ))
         
         # API Forecast
-        if api_forecast is not None and len(api_forecast) > 0:
-            api_dates = pd.to_datetime(api_forecast['time']).tolist()[:forecast_days]
-            
-            # Try different column names for temperature
-            if 'temperature_2m_mean' in api_forecast.columns:
-                api_temps = api_forecast['temperature_2m_mean'].tolist()[:forecast_days]
-            elif 'temperature_2m_max' in api_forecast.columns and 'temperature_2m_min' in api_forecast.columns:
-                # Calculate mean from max and min
-                api_temps = ((api_forecast['temperature_2m_max'] + api_forecast['temperature_2m_min']) / 2).tolist()[:forecast_days]
-            else:
-                # Fallback to first temperature column found
-                temp_cols = [col for col in api_forecast.columns if 'temperature' in col.lower()]
-                if temp_cols:
-                    api_temps = api_forecast[temp_cols[0]].tolist()[:forecast_days]
-                else:
-                    api_temps = None
-            
-            if api_temps:
-                fig.add_trace(go.Scatter(
-                    x=api_dates,
-                    y=api_temps,
-                    name='API Forecast',
-                    line=dict(color='#e53e3e', width=3, dash='dash'),
-                    mode='lines+markers'
-                ))
+        if api_temps_array is not None:
+            fig.add_trace(go.Scatter(
+                x=api_dates,
+                y=api_temps_array,
+                name='API Forecast',
+                line=dict(color='#e53e3e', width=3, dash='dash'),
+                mode='lines+markers'
+            ))
         
         fig.update_layout(
+            **FORECAST_LAYOUT,
             title='Temperature Forecast Comparison',
-            xaxis_title='Date',
-            yaxis_title='Temperature (°C)',
             height=500,
             hovermode='x unified',
             legend=dict(
@@ -233,34 +338,28 @@ if train_button:
         
         # Calculate metrics against API forecast (as baseline)
         if api_forecast is not None and len(api_forecast) > 0:
-            # Get API temperatures with proper column handling
-            if 'temperature_2m_mean' in api_forecast.columns:
-                api_temps_list = api_forecast['temperature_2m_mean'].tolist()[:forecast_days]
-            elif 'temperature_2m_max' in api_forecast.columns and 'temperature_2m_min' in api_forecast.columns:
-                api_temps_list = ((api_forecast['temperature_2m_max'] + api_forecast['temperature_2m_min']) / 2).tolist()[:forecast_days]
-            else:
-                temp_cols = [col for col in api_forecast.columns if 'temperature' in col.lower()]
-                if temp_cols:
-                    api_temps_list = api_forecast[temp_cols[0]].tolist()[:forecast_days]
-                else:
-                    api_temps_list = None
-            
-            if api_temps_list:
-                api_temps_array = np.array(api_temps_list)
+            if api_temps_array is not None:
+                # Errors for all models at once: one row per model, one column per day
+                n = len(api_temps_array)
+                forecast_matrix = np.array(
+                    [result['forecast'][:n] for result in results.values()], dtype=float
+                ).reshape(-1, n)
+                abs_errors = np.abs(forecast_matrix - api_temps_array)
                 
-                metrics_data = []
-                for model_name, result in results.items():
-                    model_forecast = result['forecast'][:len(api_temps_array)]
-                    metrics = calculate_metrics(api_temps_array, model_forecast)
-                    metrics_data.append({
-                        'Model': model_name,
-                        'MAE (°C)': f"{metrics['MAE']:.2f}",
-                        'RMSE (°C)': f"{metrics['RMSE']:.2f}",
-                        'MAPE (%)': f"{metrics['MAPE']:.2f}",
-                        'Training Time (s)': f"{training_times[model_name]:.1f}"
-                    })
+                mae = abs_errors.mean(axis=1)
+                rmse = np.sqrt((abs_errors ** 2).mean(axis=1))
+                mape = (abs_errors / np.abs(api_temps_array + 1e-10)).mean(axis=1) * 100
                 
-                metrics_df = pd.DataFrame(metrics_data)
+                metrics_df = pd.DataFrame({
+                    'Model': list(results),
+                    'MAE (°C)': [f"{v:.2f}" for v in mae],
+                    'RMSE (°C)': [f"{v:.2f}" for v in rmse],
+                    'MAPE (%)': [f"{v:.2f}" for v in mape],
+                    'Training Time (s)': [
+                        "cached" if training_times[name] is None else f"{training_times[name]:.1f}"
+                        for name in results
+                    ]
+                })
                 st.dataframe(metrics_df, use_container_width=True, hide_index=True)
                 
                 st.info("📌 **Note:** Metrics calculated by comparing ML forecasts with API forecast (baseline)")
@@ -304,28 +403,17 @@ if train_button:
                 ))
                 
                 # API
-                if api_forecast is not None and len(api_forecast) > 0:
-                    # Get API temps with proper column handling
-                    if 'temperature_2m_mean' in api_forecast.columns:
-                        api_temps_for_chart = api_forecast['temperature_2m_mean'].tolist()[:forecast_days]
-                    elif 'temperature_2m_max' in api_forecast.columns and 'temperature_2m_min' in api_forecast.columns:
-                        api_temps_for_chart = ((api_forecast['temperature_2m_max'] + api_forecast['temperature_2m_min']) / 2).tolist()[:forecast_days]
-                    else:
-                        temp_cols = [col for col in api_forecast.columns if 'temperature' in col.lower()]
-                        api_temps_for_chart = api_forecast[temp_cols[0]].tolist()[:forecast_days] if temp_cols else None
-                    
-                    if api_temps_for_chart:
-                        fig_ensemble.add_trace(go.Scatter(
-                            x=api_dates,
-                            y=api_temps_for_chart,
-                            name='API',
-                            line=dict(color='#e53e3e', width=2, dash='dash')
-                        ))
+                if api_temps_array is not None:
+                    fig_ensemble.add_trace(go.Scatter(
+                        x=api_dates,
+                        y=api_temps_array,
+                        name='API',
+                        line=dict(color='#e53e3e', width=2, dash='dash')
+                    ))
                 
                 fig_ensemble.update_layout(
+                    **FORECAST_LAYOUT,
                     title='Ensemble vs API Forecast',
-                    xaxis_title='Date',
-                    yaxis_title='Temperature (°C)',
                     height=400
                 )
                 
@@ -336,7 +424,7 @@ if train_button:
                 st.markdown("- Equal weight average")
                 st.markdown(f"- {len(results)} models combined")
                 
-                if api_forecast is not None and len(api_forecast) > 0 and api_temps_list:
+                if api_temps_array is not None:
                     ensemble_metrics = calculate_metrics(api_temps_array, ensemble[:len(api_temps_array)])
                     st.markdown("**Performance:**")
                     st.metric("MAE", f"{ensemble_metrics['MAE']:.2f}°C")
@@ -377,23 +465,15 @@ if train_button:
         st.markdown("## 💾 Export Forecasts")
         
         # Prepare export data
-        export_data = {'Date': [d.strftime('%Y-%m-%d') for d in forecast_dates]}
+        export_data = {'Date': forecast_dates.strftime('%Y-%m-%d').tolist()}
         
         for model_name, result in results.items():
             export_data[f'{model_name}_Forecast'] = result['forecast']
             export_data[f'{model_name}_Lower'] = result['lower_bound']
             export_data[f'{model_name}_Upper'] = result['upper_bound']
         
-        if api_forecast is not None and len(api_forecast) > 0:
-            # Get API temps with proper column handling
-            if 'temperature_2m_mean' in api_forecast.columns:
-                export_data['API_Forecast'] = api_forecast['temperature_2m_mean'].tolist()[:forecast_days]
-            elif 'temperature_2m_max' in api_forecast.columns and 'temperature_2m_min' in api_forecast.columns:
-                export_data['API_Forecast'] = ((api_forecast['temperature_2m_max'] + api_forecast['temperature_2m_min']) / 2).tolist()[:forecast_days]
-            else:
-                temp_cols = [col for col in api_forecast.columns if 'temperature' in col.lower()]
-                if temp_cols:
-                    export_data['API_Forecast'] = api_forecast[temp_cols[0]].tolist()[:forecast_days]
+        if api_temps_array is not None:
+            export_data['API_Forecast'] = api_temps_array
         
         if len(results) > 1:
             export_data['Ensemble_Forecast'] = ensemble
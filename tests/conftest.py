@@ -0,0 +1,83 @@
+"""
+Shared fixtures for the API tests
+"""
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from api import app
+from utils import weather_api
+
+# Canned Open-Meteo values: every requested variable gets this value, except
+# the ones Open-Meteo returns as strings or whole numbers
+CANNED_VALUE = 25.5
+CANNED_INTS = {"relative_humidity_2m": 80, "weather_code": 3, "cloud_cover": 40,
+               "wind_direction_10m": 90, "wind_direction_10m_dominant": 90}
+CANNED_START = date(2025, 1, 1)
+
+def _canned(variable):
+    return CANNED_INTS.get(variable, CANNED_VALUE)
+
+def _daily_block(variables, days):
+    dates = [CANNED_START + timedelta(days=i) for i in range(days)]
+    block = {"time": [d.isoformat() for d in dates]}
+    for variable in variables:
+        if variable in ("sunrise", "sunset"):
+            hour = "06:00" if variable == "sunrise" else "18:00"
+            block[variable] = [f"{d.isoformat()}T{hour}" for d in dates]
+        else:
+            block[variable] = [_canned(variable)] * days
+    return block
+
+def _hourly_block(variables, days):
+    hours = days * 24
+    block = {"time": [f"{(CANNED_START + timedelta(days=h // 24)).isoformat()}T{h % 24:02d}:00" for h in range(hours)]}
+    for variable in variables:
+        block[variable] = [_canned(variable)] * hours
+    return block
+
+class FakeResponse:
+    """Just enough of requests.Response for the fetchers"""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+def fake_open_meteo_get(url, params=None, timeout=None):
+    """Build an Open-Meteo shaped payload for whatever the fetcher asked for"""
+    params = params or {}
+
+    if url == weather_api.GEOCODING_URL:
+        return FakeResponse({"results": [{"name": params["name"], "country": "Indonesia",
+                                          "latitude": -6.2, "longitude": 106.8}]})
+
+    payload = {"timezone": "Asia/Jakarta"}
+    if url == weather_api.HISTORICAL_URL:
+        days = (date.fromisoformat(params["end_date"]) - date.fromisoformat(params["start_date"])).days + 1
+    else:
+        days = params.get("forecast_days", 7)
+
+    if "current" in params:
+        payload["current"] = {"time": f"{CANNED_START.isoformat()}T12:00"}
+        payload["current"].update({variable: _canned(variable) for variable in params["current"]})
+    if "hourly" in params:
+        payload["hourly"] = _hourly_block(params["hourly"], days)
+    if "daily" in params:
+        payload["daily"] = _daily_block(params["daily"], days)
+    return FakeResponse(payload)
+
+@pytest.fixture(autouse=True)
+def mock_open_meteo(monkeypatch):
+    """Serve every Open-Meteo request from canned data, so no test touches the network"""
+    monkeypatch.setattr(weather_api._SESSION, "get", fake_open_meteo_get)
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole session, entered so startup/shutdown run once"""
+    with TestClient(app) as test_client:
+        yield test_client
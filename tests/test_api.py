@@ -2,50 +2,64 @@
 Unit tests for Weather Prediction API
 """
 import pytest
-from fastapi.testclient import TestClient
-from api import app
 
-client = TestClient(app)
-
-def test_root():
+def test_root(client):
     """Test root endpoint"""
     response = client.get("/")
     assert response.status_code == 200
     assert "name" in response.json()
     assert response.json()["status"] == "operational"
 
-def test_health_check():
+def test_health_check(client):
     """Test health check endpoint"""
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
-def test_current_weather():
+def test_current_weather(client):
     """Test current weather endpoint"""
     response = client.get("/api/v1/weather/current?latitude=-6.2&longitude=106.8")
-    assert response.status_code in [200, 500]  # May fail if API is down
+    assert response.status_code == 200
+    data = response.json()
+    assert data["location"] == {"latitude": -6.2, "longitude": 106.8}
+    assert data["temperature"] == 25.5
+    assert data["humidity"] == 80
+    assert data["timezone"] == "Asia/Jakarta"
+    assert isinstance(data["description"], str)
     
-def test_current_weather_invalid_coords():
+def test_current_weather_invalid_coords(client):
     """Test current weather with invalid coordinates"""
     response = client.get("/api/v1/weather/current?latitude=100&longitude=200")
     assert response.status_code == 422  # Validation error
 
-def test_hourly_forecast():
+def test_hourly_forecast(client):
     """Test hourly forecast endpoint"""
     response = client.get("/api/v1/weather/hourly?latitude=-6.2&longitude=106.8&hours=24")
-    assert response.status_code in [200, 500]
+    assert response.status_code == 200
+    data = response.json()
+    assert data["hours"] == 24
+    assert len(data["forecast"]) == 24
+    assert data["forecast"][0]["temperature_2m"] == 25.5
 
-def test_daily_forecast():
+def test_daily_forecast(client):
     """Test daily forecast endpoint"""
     response = client.get("/api/v1/weather/daily?latitude=-6.2&longitude=106.8&days=7")
-    assert response.status_code in [200, 500]
+    assert response.status_code == 200
+    data = response.json()
+    assert data["days"] == 7
+    assert len(data["forecast"]) == 7
+    assert data["forecast"][0]["temperature_2m_max"] == 25.5
 
-def test_statistics():
+def test_statistics(client):
     """Test statistics endpoint"""
     response = client.get("/api/v1/weather/statistics?latitude=-6.2&longitude=106.8&days=30")
-    assert response.status_code in [200, 500]
+    assert response.status_code == 200
+    data = response.json()
+    assert data["period_days"] == 16  # Capped at the 16-day forecast range
+    assert data["temperature"]["max"] == 25.5
+    assert data["precipitation"]["days_with_rain"] == 16
 
-def test_predict_temperature():
+def test_predict_temperature(client):
     """Test temperature prediction endpoint"""
     response = client.post(
         "/api/v1/predict/temperature",
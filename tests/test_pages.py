@@ -0,0 +1,82 @@
+"""
+Tests for numbers the Streamlit pages compute and display
+"""
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from utils import weather_api
+from conftest import fake_open_meteo_get
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / "pages"
+
+# One-decimal daily precipitation, counted back from the last archived day so
+# the analysed window sees the same values whatever today's date is. Its 95th
+# percentile is 4.65 mm: 4.7 in float64, but 4.6 if interpolated in float32
+def _precipitation(days_before_end):
+    return (days_before_end * 13 % 50) / 10
+
+def varied_history_get(url, params=None, timeout=None):
+    """Canned Open-Meteo payload, with real archive dates and varied precipitation"""
+    response = fake_open_meteo_get(url, params, timeout)
+    if url == weather_api.HISTORICAL_URL:
+        start = date.fromisoformat(params["start_date"])
+        daily = response.payload["daily"]
+        n = len(daily["time"])
+        daily["time"] = [(start + timedelta(days=i)).isoformat() for i in range(n)]
+        daily["precipitation_sum"] = [_precipitation(n - 1 - i) for i in range(n)]
+    return response
+
+# Day (counted back from the last archived day) sent without a precipitation reading
+MISSING_DAY = 3
+served_days = []
+
+def history_with_gap_get(url, params=None, timeout=None):
+    """varied_history_get, with precipitation missing (null) for one day"""
+    response = varied_history_get(url, params, timeout)
+    if url == weather_api.HISTORICAL_URL:
+        precipitation = response.payload["daily"]["precipitation_sum"]
+        precipitation[len(precipitation) - 1 - MISSING_DAY] = None
+        served_days.append(len(precipitation))
+    return response
+
+def run_page(monkeypatch, page_glob, fake_get=varied_history_get):
+    monkeypatch.setattr(weather_api._SESSION, "get", fake_get)
+    st.cache_data.clear()
+
+    at = AppTest.from_file(str(next(PAGES_DIR.glob(page_glob))), default_timeout=60)
+    at.session_state["selected_lat"] = -6.2
+    at.session_state["selected_lon"] = 106.8
+    at.session_state["selected_location"] = "Jakarta"
+    at.run()
+    assert not at.exception
+    return at
+
+def test_statistics_precipitation_percentiles(monkeypatch):
+    """Precipitation percentiles and the heavy rain threshold match float64 math"""
+    at = run_page(monkeypatch, "09_*")
+
+    markdown = [m.value for m in at.markdown]
+    assert "**90th:** 4.4 mm" in markdown
+    assert "**95th:** 4.7 mm" in markdown
+    assert "**99th:** 4.9 mm" in markdown
+
+    heavy_rain = next(m for m in at.metric if m.label == "🌧️ Heavy Rain Days")
+    assert heavy_rain.delta == ">4.7mm"
+    assert heavy_rain.value == "5"
+
+def test_rainfall_intensity_skips_missing_days(monkeypatch):
+    """A day without a precipitation reading is not counted in any intensity class"""
+    served_days.clear()
+    at = run_page(monkeypatch, "08_*", fake_get=history_with_gap_get)
+
+    days = served_days[-1]
+    no_rain = sum(_precipitation(d) == 0 for d in range(days) if d != MISSING_DAY)
+
+    categories = next(m.value for m in at.markdown if "**No Rain:**" in m.value)
+    assert f"**No Rain:** {no_rain} days" in categories
+    assert f"**Light (0-5mm):** {days - 1 - no_rain} days" in categories
+    assert "**Very Heavy (>50mm):** 0 days" in categories
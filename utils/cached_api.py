@@ -0,0 +1,139 @@
+"""
+Cached wrappers around the Open-Meteo fetchers
+Streamlit reruns the whole page on every widget interaction, so pages fetch
+through these instead of hitting the API on each rerun. The 'time' column is
+parsed to datetime64 by the fetchers, so cached frames never need re-parsing
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from utils.weather_api import (
+    get_current_weather, get_historical_weather, get_hourly_forecast, get_daily_forecast
+)
+
+# Cache lifetimes in seconds: current conditions and hourly data go stale
+# quickly, daily forecasts change a few times a day and archived days not at all
+CURRENT_TTL = 600
+HOURLY_TTL = 600
+DAILY_TTL = 3600
+HISTORY_TTL = 86400
+
+# ~110 m; nearby clicks on the map share one cache entry
+COORD_DECIMALS = 3
+
+# Upper bound on simultaneous requests from one fetch_all call
+FETCH_WORKERS = 8
+
+class _FetchFailed(Exception):
+    """Raised inside the cached functions so a failed fetch (None) is not cached"""
+
+def _checked(result):
+    if result is None:
+        raise _FetchFailed
+    return result
+
+@st.cache_data(ttl=CURRENT_TTL, show_spinner=False)
+def _current(lat, lon):
+    return _checked(get_current_weather(lat, lon))
+
+@st.cache_data(ttl=HISTORY_TTL, show_spinner=False)
+def _historical(lat, lon, start_date, end_date):
+    return _checked(get_historical_weather(lat, lon, start_date, end_date))
+
+@st.cache_data(ttl=HOURLY_TTL, show_spinner=False)
+def _hourly(lat, lon, hours):
+    return _checked(get_hourly_forecast(lat, lon, hours=hours))
+
+@st.cache_data(ttl=DAILY_TTL, show_spinner=False)
+def _daily(lat, lon, days):
+    return _checked(get_daily_forecast(lat, lon, days=days))
+
+def cached_current(lat, lon):
+    """
+    Cached get_current_weather
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+
+    Returns:
+        Dictionary with current weather data (a fresh copy per call), or None on failure
+    """
+    try:
+        return _current(round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS))
+    except _FetchFailed:
+        return None
+
+def cached_historical(lat, lon, start_date, end_date):
+    """
+    Cached get_historical_weather
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+
+    Returns:
+        DataFrame with historical data (a fresh copy per call), or None on failure
+    """
+    try:
+        return _historical(round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS), start_date, end_date)
+    except _FetchFailed:
+        return None
+
+def cached_hourly(lat, lon, hours=48):
+    """
+    Cached get_hourly_forecast
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        hours: Number of hours to forecast
+
+    Returns:
+        DataFrame with hourly forecast (a fresh copy per call), or None on failure
+    """
+    try:
+        return _hourly(round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS), hours)
+    except _FetchFailed:
+        return None
+
+def cached_daily(lat, lon, days=7):
+    """
+    Cached get_daily_forecast
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        days: Number of days to forecast
+
+    Returns:
+        DataFrame with daily forecast (a fresh copy per call), or None on failure
+    """
+    try:
+        return _daily(round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS), days)
+    except _FetchFailed:
+        return None
+
+def fetch_all(calls):
+    """
+    Run several cached fetches concurrently
+
+    The fetches are network-bound, so a page that needs more than one endpoint
+    waits for the slowest request instead of the sum of them.
+
+    Args:
+        calls: List of (cached fetcher, args tuple) pairs,
+            e.g. [(cached_current, (lat, lon)), (cached_daily, (lat, lon, 7))]
+
+    Returns:
+        List of results in the same order as calls (None for failed fetches)
+    """
+    if not calls:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(len(calls), FETCH_WORKERS)) as executor:
+        futures = [executor.submit(fetcher, *args) for fetcher, args in calls]
+        return [future.result() for future in futures]
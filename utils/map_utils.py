@@ -66,7 +66,7 @@ def add_weather_marker(map_obj, lat, lon, weather_data=None, popup_text=None):
     Add weather marker to map
     
     Args:
-        map_obj: Folium map object
+        map_obj: Folium map object or FeatureGroup
         lat: Latitude
         lon: Longitude
         weather_data: Dictionary with weather information
@@ -110,7 +110,7 @@ def add_popular_cities(map_obj, show_markers=True):
     Add popular cities to map
     
     Args:
-        map_obj: Folium map object
+        map_obj: Folium map object or FeatureGroup
         show_markers: Whether to show city markers
     
     Returns:
@@ -2,6 +2,8 @@
 Machine Learning Forecasting Module
 Implements ARIMA, Prophet, LSTM, and XGBoost for weather forecasting
 """
+import os
+import functools
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,8 +15,14 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error
 
 def calculate_mape(y_true, y_pred):
     """Calculate Mean Absolute Percentage Error"""
-    y_true, y_pred = np.array(y_true), np.array(y_pred)
-    return np.mean(np.abs((y_true - y_pred) / (y_true + 1e-10))) * 100
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    
+    # One scratch array carried through every step instead of a temporary per step
+    errors = np.subtract(y_true, y_pred)
+    np.divide(errors, y_true + 1e-10, out=errors)
+    np.abs(errors, out=errors)
+    return np.mean(errors) * 100
 
 def calculate_metrics(y_true, y_pred):
     """Calculate MAE, RMSE, MAPE"""
@@ -23,52 +31,124 @@ def calculate_metrics(y_true, y_pred):
     mape = calculate_mape(y_true, y_pred)
     return {'MAE': mae, 'RMSE': rmse, 'MAPE': mape}
 
-# Feature Engineering
-def create_time_features(df):
-    """Create time-based features"""
-    df = df.copy()
-    df['day_of_week'] = df['date'].dt.dayofweek
-    df['day_of_month'] = df['date'].dt.day
-    df['month'] = df['date'].dt.month
-    df['quarter'] = df['date'].dt.quarter
-    df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
-    return df
+# Model library loaders: each heavy stack is imported on first use only, so
+# asking for ARIMA never pulls in TensorFlow
+@functools.lru_cache(maxsize=1)
+def _arima():
+    """ARIMA and auto_arima"""
+    from statsmodels.tsa.arima.model import ARIMA
+    from pmdarima import auto_arima
+    return ARIMA, auto_arima
 
-def create_lag_features(df, target_col, lags=[1, 2, 3, 7]):
-    """Create lag features"""
-    df = df.copy()
-    for lag in lags:
-        df[f'{target_col}_lag_{lag}'] = df[target_col].shift(lag)
-    return df
+@functools.lru_cache(maxsize=1)
+def _prophet():
+    """Prophet"""
+    from prophet import Prophet
+    return Prophet
+
+@functools.lru_cache(maxsize=1)
+def _keras():
+    """TensorFlow plus the Keras pieces the LSTM uses"""
+    # Must be set before TensorFlow is first imported
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    import tensorflow as tf
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Dropout
+    return tf, Sequential, LSTM, Dense, Dropout
 
-def create_rolling_features(df, target_col, windows=[7, 14, 30]):
-    """Create rolling statistics"""
-    df = df.copy()
+@functools.lru_cache(maxsize=1)
+def _xgb():
+    """XGBRegressor"""
+    from xgboost import XGBRegressor
+    return XGBRegressor
+
+# Feature Engineering
+def build_features(df, target_col='temperature_2m_mean', lags=(1, 2, 3, 7), windows=(7, 14, 30)):
+    """
+    Time, lag and rolling features in one pass
+    
+    Calendar, lag and rolling columns are filled into one preallocated matrix
+    instead of copying the frame and assigning column by column.
+    
+    Args:
+        df: DataFrame with 'date' and the target column
+        target_col: Column to build lag and rolling features from
+        lags: Lag offsets in rows
+        windows: Rolling window lengths in rows
+    
+    Returns:
+        DataFrame with date, target and feature columns
+    """
+    dates = pd.DatetimeIndex(df['date'])
+    target = df[target_col].to_numpy(dtype=np.float64)
+    
+    names = ['day_of_week', 'day_of_month', 'month', 'quarter', 'is_weekend']
+    names += [f'{target_col}_lag_{lag}' for lag in lags]
+    for window in windows:
+        names += [f'{target_col}_rolling_mean_{window}', f'{target_col}_rolling_std_{window}']
+    
+    features = np.empty((len(df), len(names)))
+    
+    # Calendar features
+    features[:, 0] = dates.dayofweek
+    features[:, 1] = dates.day
+    features[:, 2] = dates.month
+    features[:, 3] = dates.quarter
+    features[:, 4] = dates.dayofweek >= 5
+    
+    # Lag features: the target shifted down, NaN where there is no history yet
+    col = 5
+    for lag in lags:
+        features[:lag, col] = np.nan
+        features[lag:, col] = target[:-lag]
+        col += 1
+    
+    # Rolling statistics
+    target_series = pd.Series(target)
     for window in windows:
-        df[f'{target_col}_rolling_mean_{window}'] = df[target_col].rolling(window=window).mean()
-        df[f'{target_col}_rolling_std_{window}'] = df[target_col].rolling(window=window).std()
-    return df
+        rolling = target_series.rolling(window=window)
+        features[:, col] = rolling.mean().to_numpy()
+        features[:, col + 1] = rolling.std().to_numpy()
+        col += 2
+    
+    result = pd.DataFrame(features, columns=names, index=df.index, copy=False)
+    result.insert(0, target_col, df[target_col])
+    result.insert(0, 'date', df['date'])
+    return result
 
 # ARIMA Model
+# Orders found by auto_arima, keyed by a coarse series fingerprint: the stepwise
+# search is the slow part of train_arima, and a matching series reuses its result
+ARIMA_ORDER_CACHE_SIZE = 64
+
+@functools.lru_cache(maxsize=ARIMA_ORDER_CACHE_SIZE)
+def _auto_arima_order(series_bytes):
+    """
+    Best (p, d, q) order from auto ARIMA, remembered per exact series
+    
+    Keyed on the raw float64 bytes, so only identical data shares an order
+    (e.g. the same history trained for another horizon). lru_cache is
+    thread-safe, and a failed search raises instead of being cached.
+    """
+    _, auto_arima = _arima()
+    auto_model = auto_arima(
+        np.frombuffer(series_bytes, dtype=np.float64),
+        seasonal=False, 
+        stepwise=True,
+        suppress_warnings=True,
+        error_action='ignore',
+        max_p=5, max_q=5, max_d=2,
+        trace=False
+    )
+    return auto_model.order
+
 def train_arima(data, forecast_days=7):
     """Train ARIMA model"""
     try:
-        from statsmodels.tsa.arima.model import ARIMA
-        from pmdarima import auto_arima
-        
-        # Auto ARIMA to find best parameters
-        auto_model = auto_arima(
-            data, 
-            seasonal=False, 
-            stepwise=True,
-            suppress_warnings=True,
-            error_action='ignore',
-            max_p=5, max_q=5, max_d=2,
-            trace=False
-        )
+        ARIMA, _ = _arima()
         
-        # Get best parameters
-        order = auto_model.order
+        # Get best parameters (auto ARIMA runs only for a series not seen before)
+        order = _auto_arima_order(np.ascontiguousarray(data, dtype=np.float64).tobytes())
         
         # Train final model
         model = ARIMA(data, order=order)
@@ -96,18 +176,21 @@ def train_arima(data, forecast_days=7):
 def train_prophet(df, forecast_days=7):
     """Train Prophet model"""
     try:
-        from prophet import Prophet
+        Prophet = _prophet()
         
         # Prepare data for Prophet
         prophet_df = df[['date', 'temperature_2m_mean']].copy()
         prophet_df.columns = ['ds', 'y']
         
-        # Initialize and train model
+        # Initialize and train model: MAP fit (no MCMC) through CmdStanPy, and no
+        # daily seasonality since the series has one value per day
         model = Prophet(
-            daily_seasonality=True,
+            daily_seasonality=False,
             weekly_seasonality=True,
             yearly_seasonality=True,
-            changepoint_prior_scale=0.05
+            changepoint_prior_scale=0.05,
+            mcmc_samples=0,
+            stan_backend="CMDSTANPY"
         )
         model.fit(prophet_df)
         
@@ -133,8 +216,7 @@ def train_prophet(df, forecast_days=7):
 def train_lstm(data, forecast_days=7, lookback=30):
     """Train LSTM model"""
     try:
-        from tensorflow.keras.models import Sequential
-        from tensorflow.keras.layers import LSTM, Dense, Dropout
+        tf, Sequential, LSTM, Dense, Dropout = _keras()
         from sklearn.preprocessing import MinMaxScaler
         
         # Scale data
@@ -147,7 +229,7 @@ def train_lstm(data, forecast_days=7, lookback=30):
             X.append(scaled_data[i-lookback:i, 0])
             y.append(scaled_data[i, 0])
         
-        X, y = np.array(X), np.array(y)
+        X, y = np.array(X, dtype=np.float32), np.array(y, dtype=np.float32)
         X = X.reshape((X.shape[0], X.shape[1], 1))
         
         # Build model
@@ -162,20 +244,32 @@ def train_lstm(data, forecast_days=7, lookback=30):
         
         model.compile(optimizer='adam', loss='mse')
         
-        # Train model
-        model.fit(X, y, epochs=50, batch_size=32, verbose=0)
+        # Train model from a prefetching pipeline, reshuffled every epoch like fit(X, y)
+        dataset = (
+            tf.data.Dataset.from_tensor_slices((X, y))
+            .shuffle(len(X), reshuffle_each_iteration=True)
+            .batch(32)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        model.fit(dataset, epochs=50, verbose=0)
         
-        # Forecast
-        last_sequence = scaled_data[-lookback:]
-        forecasts = []
+        # Forecast: the autoregressive rollout runs as one graph call instead of
+        # a model.predict round trip per day
+        @tf.function
+        def rollout(sequence):
+            preds = tf.TensorArray(tf.float32, size=forecast_days)
+            for step in tf.range(forecast_days):
+                pred = model(sequence, training=False)
+                preds = preds.write(step, pred[0, 0])
+                # Slide the window: drop the oldest value, append the prediction
+                sequence = tf.concat([sequence[:, 1:, :], tf.reshape(pred, (1, 1, 1))], axis=1)
+            return preds.stack()
         
-        for _ in range(forecast_days):
-            pred = model.predict(last_sequence.reshape(1, lookback, 1), verbose=0)
-            forecasts.append(pred[0, 0])
-            last_sequence = np.append(last_sequence[1:], pred)
+        last_sequence = tf.constant(scaled_data[-lookback:].reshape(1, lookback, 1), dtype=tf.float32)
+        forecasts = rollout(last_sequence).numpy()
         
         # Inverse transform
-        forecasts = scaler.inverse_transform(np.array(forecasts).reshape(-1, 1)).flatten()
+        forecasts = scaler.inverse_transform(forecasts.reshape(-1, 1)).flatten()
         
         # Estimate confidence intervals (±1 std)
         std = np.std(data[-30:])
@@ -195,68 +289,67 @@ def train_lstm(data, forecast_days=7, lookback=30):
 def train_xgboost(df, forecast_days=7):
     """Train XGBoost model"""
     try:
-        from xgboost import XGBRegressor
-        from sklearn.preprocessing import StandardScaler
+        XGBRegressor = _xgb()
         
-        # Feature engineering
-        df = create_time_features(df)
-        df = create_lag_features(df, 'temperature_2m_mean', lags=[1, 2, 3, 7])
-        df = create_rolling_features(df, 'temperature_2m_mean', windows=[7, 14])
+        lags = [1, 2, 3, 7]
+        windows = [7, 14]
+        
+        # Feature engineering (target series only: the future rows below can only
+        # be built for calendar, lag and rolling features)
+        df = build_features(df, 'temperature_2m_mean', lags=lags, windows=windows)
         
         # Drop NaN
         df = df.dropna()
         
         # Prepare features
         feature_cols = [col for col in df.columns if col not in ['date', 'temperature_2m_mean', 'time']]
-        X = df[feature_cols]
+        X = df[feature_cols].to_numpy()
         y = df['temperature_2m_mean']
         
-        # Scale features
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-        
-        # Train model
+        # Train model (no feature scaling: tree splits are thresholds, so scale doesn't matter)
         model = XGBRegressor(
             n_estimators=100,
             learning_rate=0.1,
             max_depth=5,
             random_state=42
         )
-        model.fit(X_scaled, y)
+        model.fit(X, y.to_numpy())
+        
+        # Future feature matrix: calendar and rolling columns are known up front,
+        # only the lag columns depend on earlier predictions
+        temps = df['temperature_2m_mean']
+        future_dates = pd.date_range(df['date'].max() + pd.Timedelta(days=1), periods=forecast_days, freq='D')
+        future = pd.DataFrame({
+            'day_of_week': future_dates.dayofweek,
+            'day_of_month': future_dates.day,
+            'month': future_dates.month,
+            'quarter': future_dates.quarter,
+            'is_weekend': (future_dates.dayofweek >= 5).astype(int)
+        })
+        for window in windows:
+            # Rolling features (approximate: last known window)
+            future[f'temperature_2m_mean_rolling_mean_{window}'] = temps.tail(window).mean()
+            future[f'temperature_2m_mean_rolling_std_{window}'] = temps.tail(window).std()
+        for lag in lags:
+            future[f'temperature_2m_mean_lag_{lag}'] = np.nan
+        
+        future_X = future[feature_cols].to_numpy(dtype=np.float64)
+        lag_cols = {lag: feature_cols.index(f'temperature_2m_mean_lag_{lag}') for lag in lags}
         
-        # Create future features
-        last_date = df['date'].max()
-        future_dates = [last_date + timedelta(days=i+1) for i in range(forecast_days)]
+        # Predict on the booster itself: inplace_predict reads the NumPy row
+        # directly instead of building a DMatrix through the sklearn wrapper
+        booster = model.get_booster()
         
+        # Autoregressive loop: lags come from the last known values and predictions
+        recent_temps = list(temps.tail(max(lags)).to_numpy())
         forecasts = []
-        for future_date in future_dates:
-            # Create features for future date
-            future_row = {
-                'day_of_week': future_date.dayofweek,
-                'day_of_month': future_date.day,
-                'month': future_date.month,
-                'quarter': (future_date.month - 1) // 3 + 1,
-                'is_weekend': 1 if future_date.dayofweek >= 5 else 0
-            }
+        for i in range(forecast_days):
+            for lag, col in lag_cols.items():
+                future_X[i, col] = recent_temps[-lag]
             
-            # Add lag features (use last known values and predictions)
-            recent_temps = list(df['temperature_2m_mean'].tail(7).values) + forecasts
-            for lag in [1, 2, 3, 7]:
-                if len(recent_temps) >= lag:
-                    future_row[f'temperature_2m_mean_lag_{lag}'] = recent_temps[-lag]
-                else:
-                    future_row[f'temperature_2m_mean_lag_{lag}'] = df['temperature_2m_mean'].mean()
-            
-            # Add rolling features (approximate)
-            for window in [7, 14]:
-                future_row[f'temperature_2m_mean_rolling_mean_{window}'] = df['temperature_2m_mean'].tail(window).mean()
-                future_row[f'temperature_2m_mean_rolling_std_{window}'] = df['temperature_2m_mean'].tail(window).std()
-            
-            # Predict
-            X_future = pd.DataFrame([future_row])[feature_cols]
-            X_future_scaled = scaler.transform(X_future)
-            pred = model.predict(X_future_scaled)[0]
+            pred = booster.inplace_predict(future_X[i:i + 1])[0]
             forecasts.append(pred)
+            recent_temps.append(pred)
         
         # Estimate confidence intervals
         std = np.std(y[-30:])
@@ -275,11 +368,12 @@ def train_xgboost(df, forecast_days=7):
 # Ensemble Forecasting
 def ensemble_forecast(forecasts, weights=None):
     """Combine multiple forecasts using weighted average"""
-    if weights is None:
-        weights = [1/len(forecasts)] * len(forecasts)
+    # (n_models, horizon): the weighted sum is then a single matrix-vector product
+    stack = np.asarray(forecasts, dtype=np.float64)
     
-    ensemble = np.zeros_like(forecasts[0])
-    for forecast, weight in zip(forecasts, weights):
-        ensemble += forecast * weight
+    if weights is None:
+        weights = np.full(len(stack), 1 / len(stack))
+    else:
+        weights = np.asarray(weights, dtype=np.float64)
     
-    return ensemble
+    return weights @ stack
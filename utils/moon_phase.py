@@ -2,7 +2,64 @@
 Moon phase calculation utilities
 """
 import math
+import bisect
 from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Reference new moon (January 6, 2000 18:14) as integer epoch seconds, and the
+# lunar cycle (~29.53 days) in seconds
+_EPOCH_SEC = int(np.datetime64('2000-01-06T18:14:00', 's').astype('int64'))
+_LUNAR_SEC = 29.53058867 * 86400.0
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+# Upper bounds of the phase bins (as fractions of the lunar cycle)...
+PHASE_EDGES = np.array([0.0625, 0.1875, 0.3125, 0.4375, 0.5625, 0.6875, 0.8125, 0.9375])
+
+# ...and the (name, emoji, illumination %) for each bin, wrapping back to New Moon
+PHASES = (
+    ("New Moon", "🌑", 0),
+    ("Waxing Crescent", "🌒", 25),
+    ("First Quarter", "🌓", 50),
+    ("Waxing Gibbous", "🌔", 75),
+    ("Full Moon", "🌕", 100),
+    ("Waning Gibbous", "🌖", 75),
+    ("Last Quarter", "🌗", 50),
+    ("Waning Crescent", "🌘", 25),
+    ("New Moon", "🌑", 0)
+)
+
+def calculate_moon_phase_batch(dates):
+    """
+    Calculate moon phases for many dates in one vectorized pass
+    
+    Args:
+        dates: pd.DatetimeIndex (or anything it accepts, e.g. a datetime Series)
+    
+    Returns:
+        DataFrame indexed by dates with phase_name, emoji, illumination,
+        phase_percentage and age_days columns
+    """
+    dates = pd.DatetimeIndex(dates)
+    
+    # Seconds since the known new moon, in integer datetime64 math
+    secs = dates.to_numpy().astype('datetime64[s]').astype('int64') - _EPOCH_SEC
+    
+    # Calculate phase
+    cycle_secs = secs % _LUNAR_SEC
+    phase = cycle_secs / _LUNAR_SEC
+    
+    # Determine phase name and emoji (bin lookup; a value on an edge falls in the upper bin)
+    names, emojis, illuminations = zip(*PHASES)
+    bins = np.searchsorted(PHASE_EDGES, phase, side='right')
+    
+    return pd.DataFrame({
+        "phase_name": np.array(names)[bins],
+        "emoji": np.array(emojis)[bins],
+        "illumination": np.array(illuminations)[bins],
+        "phase_percentage": phase * 100,
+        "age_days": cycle_secs / 86400
+    }, index=dates)
 
 def calculate_moon_phase(date=None):
     """
@@ -17,58 +74,20 @@ def calculate_moon_phase(date=None):
     if date is None:
         date = datetime.now()
     
-    # Calculate days since known new moon (January 6, 2000)
-    known_new_moon = datetime(2000, 1, 6, 18, 14)
-    days_diff = (date - known_new_moon).total_seconds() / 86400
-    
-    # Lunar cycle is approximately 29.53 days
-    lunar_cycle = 29.53058867
+    # Seconds since the known new moon
+    secs = (date - _UNIX_EPOCH).total_seconds() - _EPOCH_SEC
     
     # Calculate phase
-    phase = (days_diff % lunar_cycle) / lunar_cycle
+    cycle_secs = secs % _LUNAR_SEC
+    phase = cycle_secs / _LUNAR_SEC
     
-    # Determine phase name and emoji
-    if phase < 0.0625:
-        phase_name = "New Moon"
-        emoji = "🌑"
-        illumination = 0
-    elif phase < 0.1875:
-        phase_name = "Waxing Crescent"
-        emoji = "🌒"
-        illumination = 25
-    elif phase < 0.3125:
-        phase_name = "First Quarter"
-        emoji = "🌓"
-        illumination = 50
-    elif phase < 0.4375:
-        phase_name = "Waxing Gibbous"
-        emoji = "🌔"
-        illumination = 75
-    elif phase < 0.5625:
-        phase_name = "Full Moon"
-        emoji = "🌕"
-        illumination = 100
-    elif phase < 0.6875:
-        phase_name = "Waning Gibbous"
-        emoji = "🌖"
-        illumination = 75
-    elif phase < 0.8125:
-        phase_name = "Last Quarter"
-        emoji = "🌗"
-        illumination = 50
-    elif phase < 0.9375:
-        phase_name = "Waning Crescent"
-        emoji = "🌘"
-        illumination = 25
-    else:
-        phase_name = "New Moon"
-        emoji = "🌑"
-        illumination = 0
+    # Determine phase name and emoji (bin lookup; a value on an edge falls in the upper bin)
+    phase_name, emoji, illumination = PHASES[bisect.bisect_right(PHASE_EDGES, phase)]
     
     return {
         "phase_name": phase_name,
         "emoji": emoji,
         "illumination": illumination,
         "phase_percentage": phase * 100,
-        "age_days": days_diff % lunar_cycle
+        "age_days": cycle_secs / 86400
     }
@@ -3,6 +3,8 @@ Weather API Integration using Open-Meteo
 Free weather API with no API key required
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -11,6 +13,39 @@ FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
 HISTORICAL_URL = "https://archive-api.open-meteo.com/v1/archive"
 
+# Open-Meteo 'time' formats; passing them skips pandas' format inference
+DAILY_TIME_FORMAT = "%Y-%m-%d"
+HOURLY_TIME_FORMAT = "%Y-%m-%dT%H:%M"
+
+# One pooled session for every Open-Meteo call: keep-alive reuses the TCP/TLS
+# connection across requests, and dropped connections or 5xx responses are
+# retried briefly before the fetcher gives up
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(500, 502, 503, 504))
+))
+
+def _to_frame(block, time_format, rows=None):
+    """
+    Build a DataFrame from an Open-Meteo column block
+    
+    Lists are sliced before the frame exists and 'time' is parsed straight from
+    its list, so no full-size frame is built only to be cut down or re-assigned.
+    
+    Args:
+        block: Dict of column name -> list of values (e.g. data["hourly"])
+        time_format: strftime format of the 'time' strings
+        rows: Keep only the first rows values of each column (default: all)
+    
+    Returns:
+        DataFrame with 'time' parsed to datetime64
+    """
+    columns = {name: values[:rows] for name, values in block.items()}
+    columns['time'] = pd.to_datetime(columns['time'], format=time_format)
+    return pd.DataFrame(columns)
+
 def search_city(city_name):
     """
     Search for city coordinates using geocoding API
@@ -29,7 +64,7 @@ def search_city(city_name):
             "format": "json"
         }
         
-        response = requests.get(GEOCODING_URL, params=params, timeout=10)
+        response = _SESSION.get(GEOCODING_URL, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -87,7 +122,7 @@ def get_current_weather(lat, lon):
             "forecast_days": 1
         }
         
-        response = requests.get(FORECAST_URL, params=params, timeout=10)
+        response = _SESSION.get(FORECAST_URL, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -157,14 +192,12 @@ def get_daily_forecast(lat, lon, days=7):
             "forecast_days": days
         }
         
-        response = requests.get(FORECAST_URL, params=params, timeout=10)
+        response = _SESSION.get(FORECAST_URL, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
         if "daily" in data:
-            df = pd.DataFrame(data["daily"])
-            df['time'] = pd.to_datetime(df['time'])
-            return df
+            return _to_frame(data["daily"], DAILY_TIME_FORMAT)
         return None
     except Exception as e:
         print(f"Error fetching daily forecast: {e}")
@@ -206,16 +239,13 @@ def get_hourly_forecast(lat, lon, hours=48):
             "forecast_days": forecast_days
         }
         
-        response = requests.get(FORECAST_URL, params=params, timeout=10)
+        response = _SESSION.get(FORECAST_URL, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
         if "hourly" in data:
-            df = pd.DataFrame(data["hourly"])
-            df['time'] = pd.to_datetime(df['time'])
             # Limit to requested hours
-            df = df.head(hours)
-            return df
+            return _to_frame(data["hourly"], HOURLY_TIME_FORMAT, rows=hours)
         return None
     except Exception as e:
         print(f"Error fetching hourly forecast: {e}")
@@ -256,14 +286,12 @@ def get_historical_weather(lat, lon, start_date, end_date):
             "timezone": "auto"
         }
         
-        response = requests.get(HISTORICAL_URL, params=params, timeout=10)
+        response = _SESSION.get(HISTORICAL_URL, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
         if "daily" in data:
-            df = pd.DataFrame(data["daily"])
-            df['time'] = pd.to_datetime(df['time'])
-            return df
+            return _to_frame(data["daily"], DAILY_TIME_FORMAT)
         return None
     except Exception as e:
         print(f"Error fetching historical weather: {e}")
@@ -301,24 +329,22 @@ WEATHER_CODES = {
     99: "Thunderstorm with heavy hail"
 }
 
+# Weather code emojis, flattened from code groups so each lookup is one dict hit
+WEATHER_EMOJI_GROUPS = [
+    ((0,), "☀️"),
+    ((1, 2), "⛅"),
+    ((3,), "☁️"),
+    ((45, 48), "🌫️"),
+    ((51, 53, 55, 56, 57, 61, 63, 65, 66, 67, 80, 81, 82), "🌧️"),
+    ((71, 73, 75, 77, 85, 86), "❄️"),
+    ((95, 96, 99), "⛈️")
+]
+WEATHER_EMOJIS = {code: emoji for codes, emoji in WEATHER_EMOJI_GROUPS for code in codes}
+
 def get_weather_description(code):
     """Get weather description from code"""
     return WEATHER_CODES.get(code, "Unknown")
 
 def get_weather_emoji(code):
     """Get weather emoji from code"""
-    if code == 0:
-        return "☀️"
-    elif code in [1, 2]:
-        return "⛅"
-    elif code == 3:
-        return "☁️"
-    elif code in [45, 48]:
-        return "🌫️"
-    elif code in [51, 53, 55, 56, 57, 61, 63, 65, 66, 67, 80, 81, 82]:
-        return "🌧️"
-    elif code in [71, 73, 75, 77, 85, 86]:
-        return "❄️"
-    elif code in [95, 96, 99]:
-        return "⛈️"
-    return "🌤️"
+    return WEATHER_EMOJIS.get(code, "🌤️")